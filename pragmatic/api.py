@@ -0,0 +1,86 @@
+from django.contrib.contenttypes.models import ContentType
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from pragmatic.models import DeletedObject
+from pragmatic.serializers import DeletedObjectSerializer
+
+
+class DeletedObjectFeedView(GenericAPIView):
+    """
+    Incremental feed of deleted objects for synchronizing clients.
+    Clients pass cursor of the previous response to receive only tombstones created since then:
+    ?cursor=<cursor>&limit=<batch size>&content_type=<app_label.model>
+    """
+    queryset = DeletedObject.objects.select_related('content_type')
+    serializer_class = DeletedObjectSerializer
+    permission_classes = [IsAdminUser]
+    pagination_class = None
+    batch_size = 1000
+    max_batch_size = 10000
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    content_type_query_param = 'content_type'
+
+    def get_cursor(self):
+        token = self.request.query_params.get(self.cursor_query_param)
+
+        if not token:
+            return None
+
+        cursor = DeletedObject.objects.decode_cursor(token)
+
+        if cursor is None:
+            raise ValidationError({self.cursor_query_param: _('Invalid cursor')})
+
+        return cursor
+
+    def get_batch_size(self):
+        limit = self.request.query_params.get(self.limit_query_param)
+
+        if not limit:
+            return self.batch_size
+
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValidationError({self.limit_query_param: _('Invalid limit')})
+
+        return max(1, min(limit, self.max_batch_size))
+
+    def filter_queryset(self, queryset):
+        content_types = []
+
+        for natural_key in self.request.query_params.getlist(self.content_type_query_param):
+            try:
+                content_types.append(ContentType.objects.get_by_natural_key(*natural_key.split('.')))
+            except (ContentType.DoesNotExist, TypeError):
+                raise ValidationError({self.content_type_query_param: _('Invalid content type %s') % natural_key})
+
+        if content_types:
+            queryset = queryset.filter(content_type__in=content_types)
+
+        return queryset
+
+    def get(self, request, *args, **kwargs):
+        cursor = self.get_cursor()
+        batch_size = self.get_batch_size()
+        queryset = self.filter_queryset(self.get_queryset())
+
+        # fetch one more tombstone to find out whether there are more of them
+        objects = list(queryset.since(cursor)[:batch_size + 1])
+        has_more = len(objects) > batch_size
+        objects = objects[:batch_size]
+
+        if objects:
+            cursor = DeletedObject.objects.get_cursor(objects[-1])
+
+        return Response({
+            'results': self.get_serializer(objects, many=True).data,
+            'cursor': DeletedObject.objects.encode_cursor(cursor) if cursor else None,
+            'has_more': has_more,
+        })
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class PragmaticConfig(AppConfig):
+    name = 'pragmatic'
+    verbose_name = _('Pragmatic')
+    default_auto_field = 'django.db.models.BigAutoField'
+
+    def ready(self):
+        # register system checks
+        from pragmatic import checks  # noqa: F401
@@ -0,0 +1,134 @@
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+from python_pragmatic.classes import get_subclasses
+
+
+def get_model_indexes(model):
+    """
+    Return dict of {index name: tuple of field names} of all indexes of model.
+    Unnamed indexes (unique_together, db_index, ...) are keyed by tuples starting with None.
+    """
+    opts = model._meta
+    indexes = {}
+
+    for index in opts.indexes:
+        indexes[index.name] = tuple(field.lstrip('-') for field in index.fields)
+
+    for constraint in opts.constraints:
+        fields = getattr(constraint, 'fields', None)
+        if fields:
+            indexes[constraint.name] = tuple(fields)
+
+    for number, fields in enumerate(opts.unique_together):
+        indexes[(None, 'unique_together', number)] = tuple(fields)
+
+    for number, fields in enumerate(getattr(opts, 'index_together', ())):
+        indexes[(None, 'index_together', number)] = tuple(fields)
+
+    for field in opts.concrete_fields:
+        if field.primary_key or field.unique or field.db_index:
+            indexes[(None, field.name)] = (field.name,)
+
+    return indexes
+
+
+def get_field_name(model, name):
+    if name == 'pk':
+        return model._meta.pk.name
+
+    try:
+        return model._meta.get_field(name).name
+    except FieldDoesNotExist:
+        return None
+
+
+@checks.register(checks.Tags.models)
+def check_sorting_indexes(app_configs=None, **kwargs):
+    """
+    Warn about sorting options of SortingListViewMixin views which are not backed by a database index
+    """
+    from pragmatic.mixins import SortingListViewMixin
+    errors = []
+
+    for view_class in dict.fromkeys(get_subclasses(SortingListViewMixin)):
+        model = getattr(view_class, 'model', None)
+        sorting_options = getattr(view_class, 'sorting_options', None)
+
+        if model is None or not isinstance(sorting_options, dict):
+            continue
+
+        if app_configs is not None and model._meta.app_config not in app_configs:
+            continue
+
+        indexes = get_model_indexes(model)
+
+        for key, value in sorting_options.items():
+            ordering = value[1] if isinstance(value, tuple) and len(value) > 1 else key
+            index_name = value[2] if isinstance(value, tuple) and len(value) > 2 else None
+            first = ordering[0] if isinstance(ordering, (list, tuple)) and ordering else ordering
+
+            if not isinstance(first, str) or LOOKUP_SEP in first:
+                # expressions and related lookups cannot be verified
+                continue
+
+            field_name = get_field_name(model, first.lstrip('-'))
+
+            if field_name is None:
+                continue
+
+            if index_name is not None:
+                if index_name not in indexes:
+                    errors.append(checks.Warning(
+                        f"Sorting option '{key}' declares index '{index_name}' which does not exist on {model._meta.label}.",
+                        obj=view_class,
+                        id='pragmatic.W001',
+                    ))
+                elif indexes[index_name][0] != field_name:
+                    errors.append(checks.Warning(
+                        f"Sorting option '{key}' declares index '{index_name}' which does not start with field '{field_name}'.",
+                        obj=view_class,
+                        id='pragmatic.W002',
+                    ))
+            elif not any(fields and fields[0] == field_name for fields in indexes.values()):
+                errors.append(checks.Warning(
+                    f"Sorting option '{key}' orders by field '{field_name}' of {model._meta.label} which has no matching index.",
+                    hint=f"Add an index starting with '{field_name}' or declare the backing index in sorting options.",
+                    obj=view_class,
+                    id='pragmatic.W003',
+                ))
+
+    return errors
+
+
+@checks.register()
+def check_pdf_async_storage(app_configs=None, **kwargs):
+    """
+    Background renders of pdf_async PdfDetailMixin views need a storage shared with the web servers
+    """
+    from django.conf import settings
+    from pragmatic.mixins import PdfDetailMixin
+
+    if getattr(settings, 'PRAGMATIC_PDF_CACHE_STORAGE', None):
+        return []
+
+    errors = []
+
+    for view_class in dict.fromkeys(get_subclasses(PdfDetailMixin)):
+        if not getattr(view_class, 'pdf_async', False):
+            continue
+
+        if view_class.get_pdf_cache is not PdfDetailMixin.get_pdf_cache:
+            # view chooses its own storage
+            continue
+
+        errors.append(checks.Error(
+            f"{view_class.__qualname__} renders PDFs in background but PRAGMATIC_PDF_CACHE_STORAGE is not set.",
+            hint="The default storage is a temporary directory local to each server, so the worker may store "
+                 "the PDF where the web servers cannot read it. Set PRAGMATIC_PDF_CACHE_STORAGE to a shared private "
+                 "storage or override get_pdf_cache().",
+            obj=view_class,
+            id='pragmatic.E001',
+        ))
+
+    return errors
@@ -1,11 +1,98 @@
-from functools import wraps
+import logging
+import time
+from functools import partial, wraps
 from django.contrib.auth.decorators import user_passes_test
 from django.contrib.auth.models import Permission
 from django.core.cache import cache
-from django.core.exceptions import PermissionDenied, ObjectDoesNotExist
+from django.core.exceptions import PermissionDenied
+from django.db import OperationalError
+from django.db.models.signals import post_migrate, post_save, post_delete
 from python_pragmatic.classes import get_subclasses
 
 
+lock_logger = logging.getLogger('pragmatic.locks')
+
+
+class PermissionCatalog(object):
+    """
+    Process-wide lookup of Permission objects by 'app_label.codename'.
+    All permissions are loaded with a single query on first use and
+    the catalog is cleared after migrations or when a permission changes.
+    """
+    _permissions = None
+
+    @classmethod
+    def get(cls, perm):
+        if cls._permissions is None:
+            cls._permissions = {
+                f'{permission.content_type.app_label}.{permission.codename}': permission
+                for permission in Permission.objects.select_related('content_type')
+            }
+
+        return cls._permissions.get(perm, None)
+
+    @classmethod
+    def clear(cls, **kwargs):
+        cls._permissions = None
+
+
+post_migrate.connect(PermissionCatalog.clear, dispatch_uid='pragmatic_permission_catalog_post_migrate')
+post_save.connect(PermissionCatalog.clear, sender=Permission, dispatch_uid='pragmatic_permission_catalog_post_save')
+post_delete.connect(PermissionCatalog.clear, sender=Permission, dispatch_uid='pragmatic_permission_catalog_post_delete')
+
+
+def _memoized_user_check(user, method, arg):
+    # results are stored on the user instance, which lives as long as the request
+    results = getattr(user, '_pragmatic_permission_results', None)
+
+    if results is None:
+        results = {}
+        user._pragmatic_permission_results = results
+
+    key = (method, arg)
+
+    if key not in results:
+        results[key] = getattr(user, method)(arg)
+
+    return results[key]
+
+
+def user_has_perm(user, perm):
+    """
+    Memoized user.has_perm(perm) for the lifetime of the user instance (request).
+    """
+    return _memoized_user_check(user, 'has_perm', perm)
+
+
+def user_has_module_perms(user, app_label):
+    """
+    Memoized user.has_module_perms(app_label) for the lifetime of the user instance (request).
+    """
+    return _memoized_user_check(user, 'has_module_perms', app_label)
+
+
+def user_permissions(user):
+    """
+    Memoized user.get_all_permissions() for the lifetime of the user instance (request).
+    """
+    return _memoized_user_check(user, 'get_all_permissions', None)
+
+
+def missing_permissions(user, perms):
+    """
+    Return list of permissions from perms the user does not have.
+    The user's permission set is loaded only once.
+    """
+    if isinstance(perms, str):
+        perms = (perms,)
+
+    if user.is_active and user.is_superuser:
+        return []
+
+    granted = user_permissions(user)
+    return [perm for perm in perms if perm not in granted]
+
+
 def permissions_required(app_label, login_url=None, raise_exception=False):
     """
     Decorator for views that checks whether a user has at least one app permission
@@ -15,7 +102,7 @@ def permissions_required(app_label, login_url=None, raise_exception=False):
     """
     def check_perms(user):
         # First check if the user has the permission (even anon users)
-        if user.has_module_perms(app_label):
+        if user_has_module_perms(user, app_label):
             return True
         # In case the 403 handler should be called raise the exception
         if raise_exception:
@@ -39,25 +126,63 @@ def permission_required(perm, login_url=None, raise_exception=False):
     """
     def check_perms(user):
         # First check if the user has the permission (even anon users)
-        if user.has_perm(perm):
+        if user_has_perm(user, perm):
+            return True
+        # In case the 403 handler should be called raise the exception
+        if raise_exception:
+            # Anonymous users should be redirected to login, not shown a 403
+            if not user.is_authenticated:
+                return False
+            user.permission_error = PermissionCatalog.get(perm) or perm
+            raise PermissionDenied
+        # As the last resort, show the login form
+        return False
+    return user_passes_test(check_perms, login_url=login_url)
+
+
+def _multiple_permissions_required(perms, require_all, login_url=None, raise_exception=False):
+    if isinstance(perms, str):
+        perms = (perms,)
+
+    def check_perms(user):
+        # First check if the user has the permissions (even anon users)
+        missing = missing_permissions(user, perms)
+        if not missing if require_all else len(missing) < len(perms):
             return True
         # In case the 403 handler should be called raise the exception
         if raise_exception:
             # Anonymous users should be redirected to login, not shown a 403
             if not user.is_authenticated:
                 return False
-            try:
-                app_label, codename = perm.split('.')
-                permission = Permission.objects.get(content_type__app_label=app_label, codename=codename)
-            except (ObjectDoesNotExist, ValueError):
-                permission = perm
-            user.permission_error = permission
+            user.permission_error = PermissionCatalog.get(missing[0]) or missing[0] if missing else None
             raise PermissionDenied
         # As the last resort, show the login form
         return False
     return user_passes_test(check_perms, login_url=login_url)
 
 
+def permission_required_all(perms, login_url=None, raise_exception=False):
+    """
+    Decorator for views that checks whether a user has all given permissions
+    enabled, redirecting to the log-in page if necessary.
+    User's permissions are loaded once and all perms are tested against them.
+    If the raise_exception parameter is given the PermissionDenied exception
+    is raised and first missing permission is stored in user instance.
+    """
+    return _multiple_permissions_required(perms, True, login_url=login_url, raise_exception=raise_exception)
+
+
+def permission_required_any(perms, login_url=None, raise_exception=False):
+    """
+    Decorator for views that checks whether a user has at least one of given permissions
+    enabled, redirecting to the log-in page if necessary.
+    User's permissions are loaded once and all perms are tested against them.
+    If the raise_exception parameter is given the PermissionDenied exception
+    is raised and first missing permission is stored in user instance.
+    """
+    return _multiple_permissions_required(perms, False, login_url=login_url, raise_exception=raise_exception)
+
+
 def receiver_subclasses(signal, sender, dispatch_uid_prefix, **kwargs):
     """
     A decorator for connecting receivers and all receiver's subclasses to signals. Used by passing in the
@@ -78,6 +203,62 @@ def receiver_subclasses(signal, sender, dispatch_uid_prefix, **kwargs):
     return _decorator
 
 
+class SubclassesReceiver(object):
+    """
+    Single signal receiver which calls func for sender and all its subclasses.
+    Base sender may be given as a class or as an 'app_label.ModelName' string
+    resolved lazily on first dispatch, once the app registry is ready.
+    Sender lookups are memoized, so dispatch is O(1) per sender.
+    """
+    def __init__(self, func, sender):
+        self.func = func
+        self.sender = sender
+        self.senders = {}
+        wraps(func)(self)
+
+    @property
+    def base(self):
+        if isinstance(self.sender, str):
+            from django.apps import apps
+            self.sender = apps.get_model(self.sender)
+
+        return self.sender
+
+    def matches(self, sender):
+        try:
+            return self.senders[sender]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable sender
+            return False
+
+        matches = isinstance(sender, type) and issubclass(sender, self.base)
+        self.senders[sender] = matches
+        return matches
+
+    def __call__(self, sender, **kwargs):
+        if self.matches(sender):
+            return self.func(sender=sender, **kwargs)
+
+
+def lazy_receiver_subclasses(signal, sender, dispatch_uid, **kwargs):
+    """
+    A decorator for connecting receiver to signals of sender and all its subclasses,
+    including subclasses defined (or models loaded) after the decorator runs.
+    Unlike receiver_subclasses, the receiver is connected only once::
+
+        @lazy_receiver_subclasses(post_save, 'myapp.MyModel', 'mymodel_post_save')
+        def signal_receiver(sender, **kwargs):
+            ...
+    """
+    def _decorator(func):
+        kwargs.setdefault('weak', False)
+        signal.connect(SubclassesReceiver(func, sender), dispatch_uid=dispatch_uid, **kwargs)
+        return func
+    return _decorator
+
+
 LOCK_MODES = (
     'ACCESS SHARE',
     'ROW SHARE',
@@ -90,34 +271,180 @@ LOCK_MODES = (
 )
 
 
-def require_lock(model, lock='ACCESS EXCLUSIVE'):
+def lock_table(model, lock='ACCESS EXCLUSIVE', lock_timeout=None, nowait=False, using=None):
+    """
+    Acquire PostgreSQL's table-level lock and return number of seconds spent waiting for it.
+    Wait duration (or failure) is logged to the 'pragmatic.locks' logger.
+    """
+    from django.db import DEFAULT_DB_ALIAS, connections
+
+    table = model._meta.db_table
+    sql = 'LOCK TABLE %s IN %s MODE' % (table, lock)
+
+    if nowait:
+        sql += ' NOWAIT'
+
+    with connections[using or DEFAULT_DB_ALIAS].cursor() as cursor:
+        if lock_timeout is not None:
+            # set timeout for the lock statement only
+            cursor.execute("SELECT current_setting('lock_timeout'), set_config('lock_timeout', %s, true)",
+                           ['%dms' % max(int(lock_timeout * 1000), 1)])
+            previous_lock_timeout = cursor.fetchone()[0]
+
+        start = time.monotonic()
+
+        try:
+            cursor.execute(sql)
+        except OperationalError:
+            waited = time.monotonic() - start
+            lock_logger.warning('Lock %s on %s not acquired after %.3f s', lock, table, waited,
+                                extra={'lock_table': table, 'lock_mode': lock, 'lock_wait': waited, 'lock_acquired': False})
+            raise
+
+        waited = time.monotonic() - start
+        lock_logger.debug('Lock %s on %s acquired after %.3f s', lock, table, waited,
+                          extra={'lock_table': table, 'lock_mode': lock, 'lock_wait': waited, 'lock_acquired': True})
+
+        if lock_timeout is not None:
+            cursor.execute("SELECT set_config('lock_timeout', %s, true)", [previous_lock_timeout])
+
+    return waited
+
+
+def require_lock(model, lock='ACCESS EXCLUSIVE', lock_timeout=None, nowait=False, using=None):
     """
     Decorator for PostgreSQL's table-level lock functionality
 
     Example:
-        @transaction.commit_on_success
-        @require_lock(MyModel, 'ACCESS EXCLUSIVE')
+        @transaction.atomic
+        @require_lock(MyModel, 'ACCESS EXCLUSIVE', lock_timeout=5)
         def myview(request)
             ...
 
+    If lock_timeout (in seconds) is given or nowait is True, OperationalError
+    is raised when the lock is not acquired in time.
+
     PostgreSQL's LOCK Documentation:
     http://www.postgresql.org/docs/8.3/interactive/sql-lock.html
     """
+    if lock not in LOCK_MODES:
+        raise ValueError('%s is not a PostgreSQL supported lock mode.' % lock)
 
     def require_lock_decorator(view_func):
+        @wraps(view_func)
         def wrapper(*args, **kwargs):
-            if lock not in LOCK_MODES:
-                raise ValueError('%s is not a PostgreSQL supported lock mode.')
-            from django.db import connection
-            cursor = connection.cursor()
-            cursor.execute(
-                'LOCK TABLE %s IN %s MODE' % (model._meta.db_table, lock)
-            )
+            lock_table(model, lock, lock_timeout=lock_timeout, nowait=nowait, using=using)
             return view_func(*args, **kwargs)
         return wrapper
     return require_lock_decorator
 
 
+class LockNotAcquired(OperationalError):
+    pass
+
+
+def advisory_lock_id(key):
+    """
+    Convert integer, string or model instance to PostgreSQL advisory lock id (signed 64-bit integer).
+    """
+    if isinstance(key, int) and -2 ** 63 <= key < 2 ** 63:
+        return key
+
+    if hasattr(key, '_meta') and hasattr(key, 'pk'):
+        key = f'{key._meta.label_lower}:{key.pk}'
+
+    import hashlib
+    digest = hashlib.blake2b(str(key).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class advisory_lock(object):
+    """
+    Context manager for PostgreSQL's transaction-level advisory lock functionality.
+    Opens atomic block and acquires lock keyed by integer, string or model instance.
+    The lock is released when the block ends.
+
+    Example:
+        with advisory_lock(invoice, timeout=5):
+            ...
+
+    If timeout (in seconds) is given, pg_try_advisory_xact_lock is retried
+    until it succeeds or LockNotAcquired is raised (timeout=0 tries only once).
+
+    PostgreSQL's Advisory Locks Documentation:
+    https://www.postgresql.org/docs/current/explicit-locking.html#ADVISORY-LOCKS
+    """
+    retry_interval = 0.05
+
+    def __init__(self, key, timeout=None, shared=False, using=None):
+        self.key = key
+        self.lock_id = advisory_lock_id(key)
+        self.timeout = timeout
+        self.shared = shared
+        self.using = using
+
+    def __enter__(self):
+        from django.db import transaction
+        self.atomic = transaction.atomic(using=self.using)
+        self.atomic.__enter__()
+
+        try:
+            self.acquire()
+        except BaseException as e:
+            self.atomic.__exit__(type(e), e, e.__traceback__)
+            raise
+
+        return self
+
+    def __exit__(self, type, value, traceback):
+        return self.atomic.__exit__(type, value, traceback)
+
+    def acquire(self):
+        from django.db import DEFAULT_DB_ALIAS, connections
+        shared = '_shared' if self.shared else ''
+
+        with connections[self.using or DEFAULT_DB_ALIAS].cursor() as cursor:
+            if self.timeout is None:
+                cursor.execute(f'SELECT pg_advisory_xact_lock{shared}(%s)', [self.lock_id])
+                return
+
+            deadline = time.monotonic() + self.timeout
+
+            while True:
+                cursor.execute(f'SELECT pg_try_advisory_xact_lock{shared}(%s)', [self.lock_id])
+
+                if cursor.fetchone()[0]:
+                    return
+
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    raise LockNotAcquired(f'Advisory lock {self.key} not acquired within {self.timeout} seconds.')
+
+                time.sleep(min(self.retry_interval, remaining))
+
+
+def require_advisory_lock(key, timeout=None, shared=False, using=None):
+    """
+    Decorator for PostgreSQL's advisory lock functionality.
+    Key may be a callable which gets the arguments of decorated function.
+
+    Example:
+        @require_advisory_lock(lambda request, pk: f'invoice:{pk}', timeout=5)
+        def myview(request, pk)
+            ...
+    """
+    def require_advisory_lock_decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            lock_key = key(*args, **kwargs) if callable(key) else key
+
+            with advisory_lock(lock_key, timeout=timeout, shared=shared, using=using):
+                return func(*args, **kwargs)
+        return wrapper
+    return require_advisory_lock_decorator
+
+
 class Cached(object):
     def __init__(self, key, version=None, user=None, per_user=True, timeout=None):
         self.cache_key = key
@@ -148,6 +475,41 @@ class Cached(object):
             # save to cache
             cache.set(self.key, data, version=self.version, timeout=self.timeout)
 
+    @classmethod
+    def many(cls, keys, compute=None, version=None, user=None, per_user=True, timeout=None, max_workers=None):
+        """
+        Resolve many cached values with a single ``get_many`` and a single ``set_many``.
+
+        ``compute(key)`` is called only for keys missing in the cache (in a thread pool
+        of ``max_workers`` threads if given). Returns a dict of {key: value}; without
+        ``compute`` the missing keys are mapped to None.
+        """
+        keys = list(keys)
+        cache_keys = {key: cls(key, version=version, user=user, per_user=per_user, timeout=timeout).key for key in keys}
+
+        # read cache
+        cached = cache.get_many(cache_keys.values(), version=version) if timeout != 0 else {}
+        values = {key: cached.get(cache_key) for key, cache_key in cache_keys.items()}
+        missing = [key for key, value in values.items() if value is None]
+
+        if not missing or compute is None:
+            return values
+
+        if max_workers and len(missing) > 1:
+            from pragmatic.utils import run_in_parallel
+            computed = run_in_parallel({key: partial(compute, key) for key in missing}, max_workers=max_workers)
+        else:
+            computed = {key: compute(key) for key in missing}
+
+        values.update(computed)
+
+        if timeout != 0:
+            # save to cache
+            cache.set_many({cache_keys[key]: value for key, value in computed.items() if value is not None},
+                           version=version, timeout=timeout)
+
+        return values
+
     @staticmethod
     def cache_decorator(*args, **kwargs):
         def _decorator(func):
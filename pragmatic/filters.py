@@ -4,7 +4,8 @@ from django import forms
 from django.apps import apps
 from django.core.cache import cache
 from django.core.validators import EMPTY_VALUES
-from django.db.models import Max, Min, Count, Q
+from django.db import connections
+from django.db.models import Q
 from django_filters.constants import EMPTY_VALUES
 from pragmatic.fields import TruncatedModelChoiceField, RangeField, SliderField
 from django.core.exceptions import ImproperlyConfigured
@@ -142,28 +143,12 @@ class SliderFilter(django_filters.Filter):
         qs = getattr(qs, self.queryset_method)()
 
         try:
-            if not qs.exists():
-                return {}
-        except:
+            min_value, max_value, count_values, segments = self.get_histogram(qs, field_name)
+        except Exception:
             return {}
 
-        qs = qs.values(field_name, 'id')
-        min_max_count_value = qs.aggregate(Max(field_name), Min(field_name), Count('id'))
-        min_value = min_max_count_value[f'{field_name}__min']
-        max_value = min_max_count_value[f'{field_name}__max']
-        count_values = min_max_count_value['id__count']
-        aggregate_params = {}
-        segments = {}
-
-        if max_value is not None and min_value is not None:
-            segment = (max_value - min_value) / self.count
-
-            for num in range(0, self.count):
-                segment_name = 'segment_' + str(num)
-                query_args = {f'{field_name}__range': (min_value + segment * num, min_value + segment * (num + 1))}
-                aggregate_params.update({segment_name: Count('pk', filter=Q(**query_args))})
-
-            segments = qs.aggregate(**aggregate_params)
+        if not count_values:
+            return {}
 
         store = {
             'segments': segments,
@@ -179,3 +164,51 @@ class SliderFilter(django_filters.Filter):
             pass
 
         return store
+
+    def get_histogram(self, qs, field_name):
+        """
+        Return (min, max, count, segments) of field values computed in a single query:
+        rows are read once into CTE and grouped by index of equal-width bucket
+        (width_bucket on PostgreSQL, FLOOR elsewhere)
+        """
+        connection = connections[qs.db]
+        # compiled for the database of queryset (sql_with_params() would use the default one)
+        sql, params = qs.order_by().values_list(field_name).query.get_compiler(using=qs.db).as_sql()
+
+        if connection.vendor == 'postgresql':
+            bucket = 'WIDTH_BUCKET(v.value, b.lo, b.hi, %s) - 1'
+        else:
+            bucket = 'FLOOR((v.value - b.lo) * %s / (b.hi - b.lo))'
+
+        # CTE referenced twice is materialized, so the table is scanned once
+        histogram_sql = (
+            f'WITH v (value) AS ({sql}), b (lo, hi) AS (SELECT MIN(value), MAX(value) FROM v) '
+            f'SELECT CASE WHEN v.value IS NULL THEN NULL WHEN b.lo = b.hi THEN 0 ELSE {bucket} END AS bucket, '
+            f'COUNT(*), MIN(b.lo), MAX(b.hi) '
+            f'FROM v CROSS JOIN b GROUP BY 1'
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute(histogram_sql, (*params, self.count))
+            rows = cursor.fetchall()
+
+        model_field = qs.model._meta.get_field(field_name)
+        min_value = max_value = None
+        count_values = 0
+        segments = {}
+
+        for bucket, count, lo, hi in rows:
+            count_values += count
+
+            # rows with NULL value are counted but don't belong to any bucket
+            if bucket is not None:
+                # the maximum falls right behind the last bucket
+                segment_name = 'segment_' + str(min(int(bucket), self.count - 1))
+                segments[segment_name] = segments.get(segment_name, 0) + count
+                min_value = model_field.to_python(lo)
+                max_value = model_field.to_python(hi)
+
+        if segments:
+            segments = {'segment_' + str(num): segments.get('segment_' + str(num), 0) for num in range(0, self.count)}
+
+        return min_value, max_value, count_values, segments
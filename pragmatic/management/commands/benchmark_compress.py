@@ -0,0 +1,75 @@
+import io
+import os
+import random
+import time
+import zipfile
+from functools import partial
+
+from django.core.management import BaseCommand
+
+from pragmatic.utils import compress
+
+
+class Command(BaseCommand):
+    help = 'Compare zipfile.writestr baseline, sequential and parallel compression of generated CSV and image-like files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--files', type=int, default=200, help='Number of files')
+        parser.add_argument('--size', type=int, default=512, help='Size of each file in KB')
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Threads for parallel compression')
+        parser.add_argument('--level', type=int, default=None, help='Compression level (0-9)')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs of each variant, the best one is reported')
+
+    def handle(self, *args, **options):
+        files = self.generate_files(options['files'], options['size'] * 1024)
+        total_size = sum(len(file['content']) for file in files)
+        self.stdout.write(f'{len(files)} files, {total_size / 1024 / 1024:.1f} MB')
+
+        level = options['level']
+        variants = (
+            ('baseline (zipfile.writestr)', partial(self.compress_baseline, files, level)),
+            ('sequential', partial(compress, files, compression_level=level)),
+            (f'parallel ({options["workers"]} workers)', partial(compress, files, compression_level=level, max_workers=options['workers'])),
+        )
+
+        for label, run_variant in variants:
+            timings = []
+
+            for run in range(options['repeat']):
+                start = time.perf_counter()
+                archive = run_variant()
+                timings.append(time.perf_counter() - start)
+
+            size = len(archive.getvalue()) / 1024 / 1024
+            self.stdout.write(f'{label}: {min(timings):.2f} s, {size:.1f} MB')
+
+    @staticmethod
+    def compress_baseline(files, level=None):
+        """
+        Original implementation of compress(): whole archive built in memory by ZipFile.writestr
+        """
+        file_like_object = io.BytesIO()
+
+        with zipfile.ZipFile(file_like_object, mode='w', compresslevel=level) as zf:
+            for file in files:
+                zf.writestr(file['name'], file['content'], compress_type=zipfile.ZIP_DEFLATED)
+
+        file_like_object.seek(0)
+        return file_like_object
+
+    def generate_files(self, count, size):
+        files = []
+        rows = '\n'.join(f'{i};product {i};{random.randint(1, 1000)};{random.random():.4f}' for i in range(1000))
+
+        for index in range(count):
+            if index % 2:
+                # photos and other already compressed data
+                content = os.urandom(size)
+                name = f'image-{index}.jpg'
+            else:
+                content = (rows.encode('utf-8') * (size // len(rows) + 1))[:size]
+                name = f'data-{index}.csv'
+
+            files.append({'name': name, 'content': content})
+
+        return files
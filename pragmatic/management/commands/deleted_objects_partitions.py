@@ -0,0 +1,292 @@
+import datetime
+import re
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from pragmatic.models import DeletedObject
+
+
+def shift_month(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+class Command(BaseCommand):
+    help = 'Maintains monthly partitions of deleted objects table (PostgreSQL) and drops data older than retention'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--convert',
+            action='store_true',
+            help='Convert existing table to table partitioned by month'
+        )
+        parser.add_argument('--ahead',
+            type=int,
+            default=3,
+            help='Number of future monthly partitions to create'
+        )
+        parser.add_argument('--retention',
+            type=int,
+            default=getattr(settings, 'PRAGMATIC_DELETED_OBJECTS_RETENTION', None),
+            help='Number of months to keep (default: PRAGMATIC_DELETED_OBJECTS_RETENTION)'
+        )
+        parser.add_argument('--batch-size',
+            type=int,
+            default=10000,
+            help='Rows deleted at once from table which is not partitioned'
+        )
+        parser.add_argument('--dry-run',
+            action='store_true',
+            help='Print SQL statements without executing them'
+        )
+
+    def handle(self, *args, **options):
+        self.using = router.db_for_write(DeletedObject)
+        self.connection = connections[self.using]
+        self.table = DeletedObject._meta.db_table
+        self.dry_run = options['dry_run']
+        self.verbosity = options['verbosity']
+        this_month = timezone.now().date().replace(day=1)
+
+        if options['convert']:
+            self.convert(this_month, options['ahead'])
+        elif self.is_partitioned():
+            self.create_partitions(this_month, shift_month(this_month, options['ahead']))
+
+        retention = options['retention']
+
+        if retention:
+            cutoff = shift_month(this_month, -retention)
+
+            if self.is_partitioned():
+                self.drop_partitions(cutoff)
+            else:
+                self.delete_expired(cutoff, options['batch_size'])
+
+    def qn(self, name):
+        return self.connection.ops.quote_name(name)
+
+    def run_sql(self, sql):
+        if self.dry_run or self.verbosity > 1:
+            self.stdout.write(f'{sql};')
+
+        if not self.dry_run:
+            with self.connection.cursor() as cursor:
+                cursor.execute(sql)
+
+    def fetch(self, sql, params=None):
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def is_partitioned(self):
+        if self.connection.vendor != 'postgresql':
+            return False
+
+        return self.fetch(
+            'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))',
+            [self.table]
+        )[0][0]
+
+    def get_partition_name(self, month):
+        return f'{self.table}_p{month:%Y%m}'
+
+    def get_partitions(self):
+        """
+        Return dict of {first day of month: partition name} of monthly partitions
+        """
+        pattern = re.compile(rf'^{re.escape(self.table)}_p(\d{{4}})(\d{{2}})$')
+        partitions = {}
+
+        rows = self.fetch(
+            'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+            'WHERE i.inhparent = to_regclass(%s)',
+            [self.table]
+        )
+
+        for name, in rows:
+            match = pattern.match(name)
+
+            if match:
+                partitions[datetime.date(int(match.group(1)), int(match.group(2)), 1)] = name
+
+        return partitions
+
+    def get_default_partition_name(self):
+        return f'{self.table}_default'
+
+    def get_default_months(self):
+        """
+        Return months of rows which landed in the default partition (no monthly partition existed for them)
+        """
+        default = self.get_default_partition_name()
+
+        if not self.fetch('SELECT to_regclass(%s) IS NOT NULL', [default])[0][0]:
+            return []
+
+        datetime_column = self.qn(DeletedObject._meta.get_field('datetime').column)
+        # in time zone of the session, the same as bounds of partitions
+        rows = self.fetch(f"SELECT DISTINCT date_trunc('month', {datetime_column})::date FROM {self.qn(default)}")
+        return [month for month, in rows]
+
+    def has_identity(self):
+        return bool(self.fetch(
+            "SELECT attidentity FROM pg_attribute WHERE attrelid = to_regclass(%s) AND attname = 'id'",
+            [self.table]
+        )[0][0])
+
+    def create_partitions(self, first_month, last_month):
+        """
+        Create monthly partitions from first_month to last_month and for rows in the default partition.
+        Partition of range which has rows in the default partition can't be created, so the default
+        partition is detached meanwhile and its rows are moved into the new partitions.
+        """
+        existing = self.get_partitions() if self.is_partitioned() else {}
+        default_months = set(self.get_default_months())
+        months = set(default_months)
+        month = first_month
+
+        while month <= last_month:
+            months.add(month)
+            month = shift_month(month, 1)
+
+        missing = sorted(months - set(existing))
+
+        if not missing:
+            return
+
+        table = self.qn(self.table)
+        default = self.qn(self.get_default_partition_name())
+        datetime_column = self.qn(DeletedObject._meta.get_field('datetime').column)
+        overriding = ' OVERRIDING SYSTEM VALUE' if default_months and self.has_identity() else ''
+
+        with transaction.atomic(using=self.using):
+            if default_months:
+                self.run_sql(f'ALTER TABLE {table} DETACH PARTITION {default}')
+
+            for month in missing:
+                name = self.get_partition_name(month)
+                self.run_sql(
+                    f'CREATE TABLE IF NOT EXISTS {self.qn(name)} PARTITION OF {table} '
+                    f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{shift_month(month, 1):%Y-%m-%d}')"
+                )
+                self.stdout.write(f'Partition {name} created')
+
+            if default_months:
+                self.run_sql(
+                    f'WITH moved AS (DELETE FROM {default} RETURNING *) '
+                    f'INSERT INTO {table}{overriding} SELECT * FROM moved'
+                )
+                self.run_sql(f'ALTER TABLE {table} ATTACH PARTITION {default} DEFAULT')
+                self.stdout.write('Rows of default partition moved to monthly partitions')
+
+    def drop_partitions(self, cutoff):
+        """
+        Drop partitions with all rows older than cutoff
+        """
+        for month, name in sorted(self.get_partitions().items()):
+            if shift_month(month, 1) <= cutoff:
+                self.run_sql(f'DROP TABLE {self.qn(name)}')
+                self.stdout.write(f'Partition {name} dropped')
+
+    def delete_expired(self, cutoff, batch_size):
+        """
+        Delete rows older than cutoff in batches from table which is not partitioned
+        """
+        cutoff = timezone.make_aware(datetime.datetime.combine(cutoff, datetime.time.min))
+        queryset = DeletedObject.objects.using(self.using).filter(datetime__lt=cutoff)
+        deleted = 0
+
+        if self.dry_run:
+            self.stdout.write(f'{queryset.count()} deleted objects older than {cutoff:%Y-%m-%d} would be deleted')
+            return
+
+        while True:
+            ids = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+
+            if not ids:
+                break
+
+            DeletedObject.objects.using(self.using).filter(pk__in=ids).delete()
+            deleted += len(ids)
+
+        self.stdout.write(f'{deleted} deleted objects older than {cutoff:%Y-%m-%d} deleted')
+
+    def convert(self, this_month, ahead):
+        """
+        Recreate table as partitioned by range of datetime (primary key becomes (id, datetime))
+        keeping its rows, indexes, foreign keys and ID sequence
+        """
+        if self.connection.vendor != 'postgresql':
+            raise CommandError('Partitioning is supported on PostgreSQL only')
+
+        if self.is_partitioned():
+            self.stdout.write(f'Table {self.table} is partitioned already')
+            return
+
+        table = self.qn(self.table)
+        old_table = f'{self.table}_unpartitioned'
+        datetime_column = self.qn(DeletedObject._meta.get_field('datetime').column)
+
+        with transaction.atomic(using=self.using):
+            first = self.fetch(f'SELECT MIN({datetime_column}) FROM {table}')[0][0]
+            first_month = first.date().replace(day=1) if first else this_month
+            constraints = self.fetch(
+                'SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint '
+                "WHERE conrelid = to_regclass(%s) AND contype IN ('p', 'f')",
+                [self.table]
+            )
+            indexes = self.fetch(
+                'SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s '
+                'AND indexname NOT IN (SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s))',
+                [self.table, self.table]
+            )
+            identity = self.has_identity()
+            sequence = self.fetch("SELECT pg_get_serial_sequence(%s, 'id')", [self.table])[0][0]
+
+            # free names of constraints and indexes for the new table
+            self.run_sql(f'ALTER TABLE {table} RENAME TO {self.qn(old_table)}')
+
+            for name, constraint_type, definition in constraints:
+                self.run_sql(f'ALTER TABLE {self.qn(old_table)} DROP CONSTRAINT {self.qn(name)}')
+
+            for name, definition in indexes:
+                self.run_sql(f'DROP INDEX {self.qn(name)}')
+
+            self.run_sql(
+                f'CREATE TABLE {table} (LIKE {self.qn(old_table)} INCLUDING DEFAULTS INCLUDING IDENTITY) '
+                f'PARTITION BY RANGE ({datetime_column})'
+            )
+
+            # unique constraints of partitioned table have to include partition key
+            for name, constraint_type, definition in constraints:
+                if constraint_type == 'p':
+                    self.run_sql(f'ALTER TABLE {table} ADD CONSTRAINT {self.qn(name)} PRIMARY KEY (id, {datetime_column})')
+
+            self.create_partitions(first_month, shift_month(this_month, ahead))
+            self.run_sql(f'CREATE TABLE {self.qn(self.get_default_partition_name())} PARTITION OF {table} DEFAULT')
+
+            overriding = ' OVERRIDING SYSTEM VALUE' if identity else ''
+            self.run_sql(f'INSERT INTO {table}{overriding} SELECT * FROM {self.qn(old_table)}')
+
+            if identity:
+                self.run_sql(
+                    f"SELECT setval(pg_get_serial_sequence('{self.table}', 'id'), "
+                    f'COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)'
+                )
+            elif sequence:
+                # keep serial sequence when the old table is dropped
+                self.run_sql(f'ALTER SEQUENCE {sequence} OWNED BY {table}.id')
+
+            for name, definition in indexes:
+                self.run_sql(definition)
+
+            for name, constraint_type, definition in constraints:
+                if constraint_type == 'f':
+                    self.run_sql(f'ALTER TABLE {table} ADD CONSTRAINT {self.qn(name)} {definition}')
+
+            self.run_sql(f'DROP TABLE {self.qn(old_table)}')
+
+        self.stdout.write(f'Table {self.table} converted to partitioned table')
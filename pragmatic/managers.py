@@ -1,7 +1,10 @@
+from collections import Counter
+
 from django.conf import settings
 from django.contrib.sites.shortcuts import get_current_site
 from django.core.mail import EmailMultiAlternatives
 from django.core.validators import EMPTY_VALUES
+from django.db import connections, models, router, transaction
 from django.template import loader, TemplateDoesNotExist
 
 
@@ -77,3 +80,77 @@ class EmailManager(object):
             send_mail_in_background.delay(email)
         else:
             return email.send()
+
+
+class TrackDeletesQuerySetMixin(object):
+    """
+    QuerySet.delete() records DeletedObject tombstones of deleted objects in one batch
+    (by pragmatic.signals.deleted_objects_tracker) and keeps Django's fast delete.
+    Object strings are read by the same query as the IDs from model's DELETED_OBJECT_STR_FIELD.
+    """
+    def delete(self):
+        from pragmatic.signals import deleted_objects_tracker
+
+        if deleted_objects_tracker.is_tracked(self.model):
+            # recorded by post_delete signal
+            return super().delete()
+
+        # checks of QuerySet.delete(), values_list() below would accept these querysets
+        self._not_support_combined_queries('delete')
+
+        if self.query.is_sliced:
+            raise TypeError("Cannot use 'limit' or 'offset' with delete().")
+        if self.query.distinct_fields:
+            raise TypeError("Cannot call delete() after .distinct(*fields).")
+        if self._fields is not None:
+            raise TypeError("Cannot call delete() after .values() or .values_list()")
+
+        using = self._db or router.db_for_write(self.model, **self._hints)
+        object_str_field = getattr(self.model, 'DELETED_OBJECT_STR_FIELD', None)
+        fields = ['pk', object_str_field] if object_str_field else ['pk']
+        count, deleted_per_model = 0, Counter()
+
+        # exactly the rows read for tombstones are deleted, not rows matching the filter by then
+        with transaction.atomic(using=using, savepoint=False):
+            rows = list(self.using(using).order_by().values_list(*fields))
+            pks = [row[0] for row in rows]
+            batch_size = max(connections[using].ops.bulk_batch_size(['pk'], pks), 1)
+
+            for start in range(0, len(pks), batch_size):
+                batch = self.model._base_manager.using(using).filter(pk__in=pks[start:start + batch_size])
+                batch_count, batch_deleted_per_model = batch.delete()
+                count += batch_count
+                deleted_per_model.update(batch_deleted_per_model)
+
+            verbose_name = self.model._meta.verbose_name
+            rows = [(row[0], str(row[1]) if object_str_field else f'{verbose_name} #{row[0]}') for row in rows]
+            deleted_objects_tracker.add_rows(self.model, rows, using)
+
+        self._result_cache = None
+        return count, dict(deleted_per_model)
+
+
+class TrackDeletesQuerySet(TrackDeletesQuerySetMixin, models.QuerySet):
+    pass
+
+
+class TrackDeletesManagerMixin(object):
+    """
+    Deletions by querysets of this manager (including admin actions) are recorded as DeletedObject.
+    Custom queryset class of the manager is extended by TrackDeletesQuerySetMixin.
+    """
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        queryset_class = getattr(cls, '_queryset_class', None)
+
+        if queryset_class is None or issubclass(queryset_class, TrackDeletesQuerySetMixin):
+            return
+
+        if queryset_class is models.QuerySet:
+            cls._queryset_class = TrackDeletesQuerySet
+        else:
+            cls._queryset_class = type(
+                f'TrackDeletes{queryset_class.__name__}',
+                (TrackDeletesQuerySetMixin, queryset_class),
+                {'__module__': queryset_class.__module__}
+            )
@@ -37,3 +37,16 @@ class MaintenanceModeMiddleware(MiddlewareMixin):
             return HttpResponse(template.render({}, request), status=503)
         else:
             return SimpleTemplateResponse(self.template_name, status=503).render()
+
+
+class DeletedObjectsUserMiddleware(MiddlewareMixin):
+    """
+    Attributes objects deleted during request to request user
+    """
+    async_capable = False
+
+    def __call__(self, request):
+        from pragmatic.signals import deleted_objects_user
+
+        with deleted_objects_user(getattr(request, 'user', None)):
+            return super().__call__(request)
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('pragmatic', '0003_alter_deletedobject_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='deletedobject',
+            index=models.Index(fields=['content_type', 'object_id'], name='pragmatic_deleted_ct_obj_idx'),
+        ),
+    ]
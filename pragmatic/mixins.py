@@ -1,31 +1,62 @@
+import base64
 import datetime
+import decimal
+import hashlib
 import inspect
 import io
-from itertools import groupby
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from functools import partial
 
 import requests
 from django import forms
+from django.apps import apps
 from django.conf import settings
 from django.contrib import messages
-from django.contrib.admin.utils import NestedObjects
 from django.contrib.auth.mixins import PermissionRequiredMixin as DjangoPermissionRequiredMixin, AccessMixin
 from django.contrib.contenttypes.models import ContentType
-from django.core.exceptions import PermissionDenied
+from django.core.exceptions import PermissionDenied, ImproperlyConfigured, FieldDoesNotExist, ValidationError
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, default_storage
 from django.core.validators import EMPTY_VALUES
-from django.core.paginator import EmptyPage, Paginator
-from django.db import router
-from django.db.models import F, QuerySet
-from django.db.models.deletion import ProtectedError
-from django.http.response import HttpResponseRedirect, HttpResponse
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connections, models, router, transaction
+from django.db.models import F, Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.base import DEFERRED
+from django.db.models.deletion import ProtectedError, get_candidate_relations_to_delete
+from django.http import Http404
+from django.http.response import HttpResponseRedirect, HttpResponse, FileResponse, JsonResponse, \
+    StreamingHttpResponse, HttpResponseBadRequest
 from django.shortcuts import redirect
+from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django.utils.functional import cached_property
+from django.utils.http import quote_etag
 from django.utils.inspect import method_has_no_args
+from django.utils.module_loading import import_string
 from django.utils.safestring import mark_safe
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _, gettext
 
+from pragmatic.decorators import user_has_perm, missing_permissions
+from pragmatic.managers import TrackDeletesQuerySetMixin
 from pragmatic.models import DeletedObject
+from pragmatic.signals import deleted_objects_tracker, deleted_objects_user
+from pragmatic.utils import dispatch_task, run_in_parallel, set_pdf_metadata, stream_zip
+
+
+pdf_logger = logging.getLogger('pragmatic.pdf')
 
 
 class ReadOnlyFormMixin(forms.BaseForm):
@@ -58,6 +89,12 @@ class LoginPermissionRequiredMixin(DjangoPermissionRequiredMixin):
 
         return self.permission_required
 
+    def has_permission(self):
+        """
+        Check permissions memoized for the current request.
+        """
+        return all(user_has_perm(self.request.user, perm) for perm in self.get_permission_required())
+
     def handle_no_permission(self):
         self.request.user.permission_error = self.get_permission_denied_message()
 
@@ -67,6 +104,25 @@ class LoginPermissionRequiredMixin(DjangoPermissionRequiredMixin):
         return super().handle_no_permission()
 
 
+class LoginAllPermissionsRequiredMixin(LoginPermissionRequiredMixin):
+    """
+    CBV mixin which verifies that the current user has all permissions in permission_required.
+    User's permissions are loaded once and all perms are tested against them.
+    """
+    def has_permission(self):
+        return not missing_permissions(self.request.user, self.get_permission_required())
+
+
+class LoginAnyPermissionRequiredMixin(LoginPermissionRequiredMixin):
+    """
+    CBV mixin which verifies that the current user has at least one permission in permission_required.
+    User's permissions are loaded once and all perms are tested against them.
+    """
+    def has_permission(self):
+        perms = self.get_permission_required()
+        return len(missing_permissions(self.request.user, perms)) < len(perms)
+
+
 class StaffRequiredMixin(AccessMixin):
     """
     CBV mixin which verifies that the current user is staff
@@ -119,7 +175,9 @@ class DeleteObjectMixin(object):
 
     def delete(self, request, *args, **kwargs):
         self.object = self.get_object()
-        track_deleted_objects = getattr(settings, 'PRAGMATIC_TRACK_DELETED_OBJECTS', False)
+        # models tracked by deleted_objects_tracker get tombstones by signal
+        track_deleted_objects = getattr(settings, 'PRAGMATIC_TRACK_DELETED_OBJECTS', False) and \
+            not deleted_objects_tracker.is_tracked(type(self.object))
 
         try:
             if track_deleted_objects:
@@ -130,7 +188,8 @@ class DeleteObjectMixin(object):
                 user = self.request.user
 
             # delete object
-            self.object.delete()
+            with deleted_objects_user(self.request.user):
+                self.object.delete()
 
             # show success message if available
             if self.message_success:
@@ -158,46 +217,204 @@ class DeleteObjectMixin(object):
         return context_data
 
 
+def get_pk_values(model, values):
+    """
+    Convert request values (ids of selected objects) to primary key values of model, skipping empty ones.
+    Raises ValidationError (or ValueError) if any value is not a valid primary key.
+    """
+    pk = model._meta.pk
+    pk_values = []
+
+    for value in values:
+        if value in EMPTY_VALUES:
+            continue
+
+        value = pk.to_python(value)
+        # e.g. integers out of range of database column
+        pk.run_validators(value)
+        pk_values.append(value)
+
+    return pk_values
+
+
+class BulkDeleteObjectsMixin(object):
+    """
+    Deletes objects selected in list view (by ids in request) in one transaction
+    """
+    template_name = 'confirm_delete.html'
+    title = _('Delete objects')
+    message_success = _('%(count)d objects successfully deleted.')
+    message_error = _('Objects cannot be deleted because of related objects: {}')
+    bulk_delete_param = 'id'
+    back_url = None
+    failure_url = None
+    success_url = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method in ('GET', 'POST'):
+            try:
+                ids = self.get_ids()
+            except (ValidationError, ValueError):
+                return HttpResponseBadRequest(_('Invalid objects selected'))
+
+            if not ids:
+                return HttpResponseBadRequest(_('No objects selected'))
+
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_ids(self):
+        ids = self.request.POST.getlist(self.bulk_delete_param) or self.request.GET.getlist(self.bulk_delete_param)
+        return get_pk_values(super().get_queryset().model, ids)
+
+    def get_queryset(self):
+        return super().get_queryset().filter(pk__in=self.get_ids())
+
+    def get_back_url(self):
+        return self.back_url if self.back_url else self.success_url
+
+    def get_failure_url(self):
+        return self.failure_url if self.failure_url else self.get_back_url()
+
+    def get_success_url(self):
+        return self.success_url
+
+    def get_deleted_objects(self, objects):
+        """
+        Return unsaved DeletedObject tombstones of given objects
+        """
+        user = self.request.user
+        user = user if user.is_authenticated else None
+
+        return [DeletedObject(
+            content_type=ContentType.objects.get_for_model(obj, for_concrete_model=False),
+            object_id=obj.pk,
+            object_str=str(obj),
+            user=user
+        ) for obj in objects]
+
+    def post(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        # querysets of TrackDeletesManagerMixin managers and models tracked by signal record tombstones themselves
+        track_deleted_objects = getattr(settings, 'PRAGMATIC_TRACK_DELETED_OBJECTS', False) and \
+            not deleted_objects_tracker.is_tracked(queryset.model) and \
+            not isinstance(queryset, TrackDeletesQuerySetMixin)
+
+        try:
+            with transaction.atomic(using=router.db_for_write(queryset.model)), deleted_objects_user(request.user):
+                deleted_objects = self.get_deleted_objects(queryset) if track_deleted_objects else []
+
+                # collector deletes related objects by one query per table
+                count, deleted_per_model = queryset.delete()
+
+                if deleted_objects:
+                    DeletedObject.objects.bulk_create(deleted_objects)
+        except ProtectedError as e:
+            if self.message_error:
+                protected = {}
+
+                for obj in e.protected_objects:
+                    protected[type(obj)] = protected.get(type(obj), 0) + 1
+
+                objects = [f'{_(model._meta.verbose_name_plural)} ({count})' for model, count in protected.items()]
+                messages.error(request, self.message_error.format(', '.join(objects)))
+
+            return HttpResponseRedirect(self.get_failure_url())
+
+        if self.message_success:
+            messages.success(request, self.message_success % {'count': deleted_per_model.get(queryset.model._meta.label, 0)})
+
+        return HttpResponseRedirect(self.get_success_url())
+
+    def get_context_data(self, **kwargs):
+        context_data = super().get_context_data(**kwargs)
+        context_data['title'] = self.title
+        context_data['back_url'] = self.get_back_url()
+        return context_data
+
+
 class CheckProtectedDeleteObjectMixin(DeleteObjectMixin):
+    protected_cache_timeout = 5 * 60
+    protected_max_depth = 3
+    protected_count = True
+
     def dispatch(self, request, *args, **kwargs):
-        using = router.db_for_write(self.get_object()._meta.model)
-        collector = NestedObjects(using=using)
-        collector.collect([self.get_object()])
-        protected = collector.protected
+        # summary is computed when confirmation page is shown and reused by its submission
+        protected = self.get_protected_summary(refresh=request.method == 'GET')
 
         if protected:
             objects = []
-            grouped_dict = {}
-
-            for object_type, grouper in groupby(protected, key=type):
-                if grouped_dict.get(object_type):
-                    existing_list = grouped_dict.get(object_type)
-                    for obj in list(grouper):
-                        existing_list.append(obj)
-
-                    grouped_dict[object_type] = existing_list
-                else:
-                    grouped_dict[object_type] = list(grouper)
-
-            for obj_type, obj_list in grouped_dict.items():
-                obj_name = _(obj_type._meta.verbose_name_plural)
-                objects.append(mark_safe(
-                    '%(text)s' % {'text': str(obj_name) + ' (' + str(len(obj_list)) + ')'}))
-
-                # try:
-                #     url = reverse_lazy(f'{obj_type._meta.app_label}:{obj_type._meta.model_name}_list')
-                #     objects.append(mark_safe(
-                #         '<a href="%(url)s" target="_blank">%(text)s</a>' % {'url': url + '?person=' + str(self.get_object().pk),
-                #                                                             'text': str(obj_name) + ' (' + str(len(obj_list)) + ')'}))
-                # except NoReverseMatch:
-                #     objects.append(mark_safe(
-                #         '%(text)s' % {'text': str(obj_name) + ' (' + str(len(obj_list)) + ')'}))
+
+            for model, count in protected:
+                obj_name = str(_(model._meta.verbose_name_plural))
+                text = f'{obj_name} ({count})' if count is not None else obj_name
+                objects.append(mark_safe('%(text)s' % {'text': text}))
 
             messages.error(self.request, _('Instance cannot be deleted because of related objects: {}').format(', '.join(objects)))
             return redirect(self.get_object().get_absolute_url())
 
         return super().dispatch(request, *args, **kwargs)
 
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+
+        return self._object
+
+    def get_protected_cache_key(self, obj):
+        return f'pragmatic:protected:{obj._meta.label_lower}:{obj.pk}'
+
+    def get_protected_summary(self, refresh=False):
+        """
+        Return list of (model, count) of objects protecting the object from deletion
+        (count is None if protected_count is False), cached for the confirmation flow
+        """
+        obj = self.get_object()
+        cache_key = self.get_protected_cache_key(obj)
+        summary = None if refresh else cache.get(cache_key)
+
+        if summary is None:
+            summary = self.collect_protected(obj)
+            cache.set(cache_key, summary, self.protected_cache_timeout)
+
+        return [(apps.get_model(label), count) for label, count in summary]
+
+    def collect_protected(self, obj):
+        """
+        Find protected objects by EXISTS/COUNT query per PROTECT foreign key (of object and of objects
+        deleted by cascade) instead of loading whole graph of related objects
+        """
+        using = router.db_for_write(obj._meta.model)
+        summary = {}
+
+        for model, lookup in self.get_protected_relations(obj._meta.model):
+            queryset = model._base_manager.using(using).filter(**{lookup: obj.pk})
+
+            if self.protected_count:
+                count = queryset.count()
+
+                if count:
+                    summary[model._meta.label] = summary.get(model._meta.label, 0) + count
+            elif model._meta.label not in summary and queryset.exists():
+                summary[model._meta.label] = None
+
+        return list(summary.items())
+
+    def get_protected_relations(self, model, path='pk', depth=0):
+        """
+        Yield (model, lookup to deleted object pk) of PROTECT foreign keys,
+        following CASCADE relations up to protected_max_depth
+        """
+        for related in get_candidate_relations_to_delete(model._meta):
+            lookup = f'{related.field.name}__{path}'
+
+            if related.on_delete is models.PROTECT:
+                yield related.related_model, lookup
+            elif related.on_delete is models.CASCADE and depth < self.protected_max_depth:
+                yield from self.get_protected_relations(related.related_model, lookup, depth + 1)
+
 
 class PickadayFormMixin(object):
     def fix_fields(self, form=None, *args, **kwargs):
@@ -258,17 +475,18 @@ class FPDFMixin(object):
     margin_right = 8
     margin_top = 8
     margin_bottom = 8
+    fonts = ()
+    image_cache_size = 64
+    image_cache_timeout = 5 * 60
+    _pdf_class = None
+    _images = OrderedDict()
+    _images_lock = threading.Lock()
 
     def render(self, **kwargs):
         # Go through keyword arguments, and either save their values to our
         # instance, or raise an error.
 
-        try:
-            from django.utils import six
-        except ImportError:
-            import six
-
-        for key, value in six.iteritems(kwargs):
+        for key, value in kwargs.items():
             setattr(self, key, value)
 
         self.init_sizes()
@@ -300,10 +518,30 @@ class FPDFMixin(object):
         self.content_width = self.page_width - self.margin_left - self.margin_right
         self.content_height = self.page_height - self.margin_top - self.margin_bottom
 
+    @classmethod
+    def get_pdf_class(cls):
+        """
+        Return FPDF class with HTML support, built once per process
+        """
+        if FPDFMixin._pdf_class is None:
+            from fpdf import FPDF
+
+            if hasattr(FPDF, 'write_html'):
+                # fpdf2 >= 2.6 supports HTML without deprecated HTMLMixin
+                class MyFPDF(FPDF):
+                    pass
+            else:
+                from fpdf import HTMLMixin
+
+                class MyFPDF(FPDF, HTMLMixin):
+                    pass
+
+            FPDFMixin._pdf_class = MyFPDF
+
+        return FPDFMixin._pdf_class
+
     def get_pdf_instance(self):
-        from fpdf import FPDF, HTMLMixin
-        class MyFPDF(FPDF, HTMLMixin):
-            pass
+        MyFPDF = self.get_pdf_class()
         page_format = dict(self.FORMATS).get(self.format, None)
         if page_format is not None:
             pdf = MyFPDF(self.orientation, 'mm', (page_format['width'], page_format['height']))
@@ -311,23 +549,140 @@ class FPDFMixin(object):
             pdf = MyFPDF(self.orientation, 'mm', self.format)
         return pdf
 
+    @classmethod
+    def get_image(cls, name, storage=default_storage):
+        """
+        Return image from storage as BytesIO. The last image_cache_size images are kept in memory
+        of the process for image_cache_timeout seconds.
+        """
+        storage_class = storage.__class__
+        storage_location = (getattr(storage, 'bucket_name', None), str(getattr(storage, 'location', '')))
+        key = (f'{storage_class.__module__}.{storage_class.__qualname__}', storage_location, name)
+        now = time.monotonic()
+
+        with FPDFMixin._images_lock:
+            cached = FPDFMixin._images.get(key)
+
+            if cached is not None and now - cached[0] < cls.image_cache_timeout:
+                FPDFMixin._images.move_to_end(key)
+                return io.BytesIO(cached[1])
+
+        with storage.open(name, 'rb') as image:
+            content = image.read()
+
+        with FPDFMixin._images_lock:
+            FPDFMixin._images[key] = (now, content)
+            FPDFMixin._images.move_to_end(key)
+
+            while len(FPDFMixin._images) > cls.image_cache_size:
+                FPDFMixin._images.popitem(last=False)
+
+        return io.BytesIO(content)
+
+    def add_fonts(self):
+        for family, style, fname in self.fonts:
+            self.pdf.add_font(family, style, fname)
+
     def init_pdf(self):
         self.pdf = self.get_pdf_instance()
         self.pdf.set_margins(self.margin_left, self.margin_top, self.margin_right)
         self.pdf.set_auto_page_break(True, margin=self.margin_bottom)
+        self.add_fonts()
         self.pdf.add_page()
 
+    def render_many(self, objects, separate=False):
+        """
+        Write content of each object (available as self.object in write_pdf_content).
+        Returns bytes of one PDF starting each object on a new page, which parses fonts and images
+        only once, or list of bytes of separate PDFs if separate is True.
+        """
+        self.init_sizes()
+        self.pdf = None
+        documents = []
+
+        for obj in objects:
+            self.object = obj
+
+            if self.pdf is None or separate:
+                self.init_pdf()
+            else:
+                self.pdf.add_page()
+
+            self.write_pdf_content()
+
+            if separate:
+                documents.append(bytes(self.pdf.output()))
+
+        if separate:
+            return documents
+
+        if self.pdf is None:
+            self.init_pdf()
+
+        return bytes(self.pdf.output())
+
     def write_pdf_content(self):
         pass
 
 
 class SafePaginator(Paginator):
-    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, count_only_id=False):
+    COUNT_EXACT = 'exact'
+    COUNT_ESTIMATE = 'estimate'
+    COUNT_HAS_MORE = 'has_more'
+    COUNT_STRATEGIES = (COUNT_EXACT, COUNT_ESTIMATE, COUNT_HAS_MORE)
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, count_only_id=False,
+                 count_strategy=COUNT_EXACT, count_estimate_threshold=10000, count_cache_key=None, count_cache_timeout=60):
         super().__init__(object_list, per_page, orphans, allow_empty_first_page)
         self.count_only_id = count_only_id
 
+        if count_strategy not in self.COUNT_STRATEGIES:
+            raise ImproperlyConfigured(f'Unknown count strategy {count_strategy}')
+
+        self.count_strategy = count_strategy
+        self.count_estimate_threshold = count_estimate_threshold
+        self.count_cache_key = count_cache_key
+        self.count_cache_timeout = count_cache_timeout
+        self.count_exact = True
+
     @cached_property
     def count(self):
+        """Return the total number of objects, across all pages, cached if count_cache_key is set"""
+        if self.count_cache_key is None:
+            return self.get_count()
+
+        cached = cache.get(self.count_cache_key)
+
+        if cached is not None:
+            count, self.count_exact = cached
+            return count
+
+        count = self.get_count()
+        cache.set(self.count_cache_key, (count, self.count_exact), timeout=self.count_cache_timeout)
+        return count
+
+    @property
+    def count_label(self):
+        # evaluate count first, it finds out whether the count is exact
+        count = self.count
+
+        if self.count_exact:
+            return count
+
+        return f'{count}+' if self.count_strategy == self.COUNT_HAS_MORE else f'~{count}'
+
+    def get_count(self):
+        """Return estimated number of objects if it exceeds threshold, exact number otherwise"""
+        if self.count_strategy == self.COUNT_ESTIMATE and isinstance(self.object_list, QuerySet):
+            estimate = self.estimate_count()
+
+            if estimate is not None and estimate >= self.count_estimate_threshold:
+                self.count_exact = False
+                return estimate
+
+        return self.get_exact_count()
+
+    def get_exact_count(self):
         """Return the total number of objects, across all pages, count only id if objectlist is queryset"""
         object_list = self.object_list.only('id') if isinstance(self.object_list, QuerySet) and self.count_only_id else self.object_list
         c = getattr(object_list, 'count', None)
@@ -335,6 +690,60 @@ class SafePaginator(Paginator):
             return c()
         return len(object_list)
 
+    def estimate_count(self):
+        """
+        Return PostgreSQL's row estimate: pg_class.reltuples for unfiltered querysets,
+        query planner estimate otherwise. None if not available.
+        """
+        queryset = self.object_list
+        query = queryset.query
+        connection = connections[queryset.db]
+
+        if connection.vendor != 'postgresql':
+            return None
+
+        with connection.cursor() as cursor:
+            if not query.where and not query.distinct and query.group_by is None and not query.is_sliced:
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [queryset.model._meta.db_table])
+                row = cursor.fetchone()
+
+                # reltuples is -1 if table was never analyzed
+                return row[0] if row and row[0] >= 0 else None
+
+            sql, params = query.get_compiler(using=queryset.db).as_sql()
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+
+        plan = json.loads(plan) if isinstance(plan, str) else plan
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def page(self, number):
+        """
+        In 'has_more' mode fetch one extra row to find out if next page exists instead of counting
+        """
+        if self.count_strategy != self.COUNT_HAS_MORE or 'count' in self.__dict__:
+            return super().page(number)
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_('That page number is not an integer'))
+
+        if number < 1:
+            raise EmptyPage(_('That page number is less than 1'))
+
+        bottom = (number - 1) * self.per_page
+        object_list = list(self.object_list[bottom:bottom + self.per_page + 1])
+
+        if not object_list and number > 1:
+            # out of range, count is needed to find the last page
+            return super().page(number)
+
+        # lower bound of count, enough to know if there is a next page
+        self.count_exact = len(object_list) <= self.per_page
+        self.__dict__['count'] = bottom + len(object_list)
+        return self._get_page(object_list[:self.per_page], number, self)
+
     def validate_number(self, number):
         try:
             return super(SafePaginator, self).validate_number(number)
@@ -345,6 +754,215 @@ class SafePaginator(Paginator):
                 raise
 
 
+class KeysetPage(object):
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.number = None
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return '<Keyset page of %s objects>' % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @cached_property
+    def next_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[-1]) if self.has_next() and self.object_list else None
+
+    @cached_property
+    def previous_cursor(self):
+        return self.paginator.encode_cursor(self.object_list[0]) if self.has_previous() and self.object_list else None
+
+
+class KeysetPaginator(object):
+    """
+    Keyset (seek) paginator: instead of OFFSET it filters rows after/before
+    the opaque cursor built from ordering fields of the queryset, so every page
+    costs the same as the first one and no count() is needed.
+    Ordering fields should not be nullable; primary key is appended as tie-breaker.
+    """
+    after_kwarg = 'after'
+    before_kwarg = 'before'
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, ordering=None, **kwargs):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.orphans = int(orphans)
+        self.allow_empty_first_page = allow_empty_first_page
+        self.ordering = self.get_ordering(ordering)
+
+    def get_ordering(self, ordering=None):
+        """
+        Return list of (field name, descending) tuples from given ordering or queryset ordering.
+        """
+        query = self.object_list.query
+
+        if ordering is None:
+            ordering = query.order_by or (query.get_meta().ordering if query.default_ordering else [])
+
+        result = []
+
+        for order in ordering:
+            if isinstance(order, str):
+                result.append((order.lstrip('-'), order.startswith('-')))
+            elif isinstance(getattr(order, 'expression', None), F):
+                result.append((order.expression.name, order.descending))
+            elif isinstance(order, F):
+                result.append((order.name, False))
+            else:
+                raise ImproperlyConfigured(f'KeysetPaginator does not support ordering by {order}')
+
+        pk_names = {'pk', self.object_list.model._meta.pk.name}
+
+        if not any(name in pk_names for name, descending in result):
+            # unique tie-breaker
+            result.append(('pk', False))
+
+        return result
+
+    @cached_property
+    def count(self):
+        # not used by keyset pagination itself, evaluated only when explicitly requested
+        return self.object_list.count()
+
+    def get_value(self, obj, name):
+        for attr in name.split(LOOKUP_SEP):
+            obj = getattr(obj, attr)
+        # ordering by relation orders by its primary key
+        return obj.pk if isinstance(obj, models.Model) else obj
+
+    def get_field(self, name):
+        model = self.object_list.model
+
+        try:
+            for attr in name.split(LOOKUP_SEP):
+                field = model._meta.pk if attr == 'pk' else model._meta.get_field(attr)
+                model = field.related_model or model
+            return field
+        except FieldDoesNotExist:
+            return None
+
+    def encode_value(self, value):
+        # lossless, DjangoJSONEncoder truncates microseconds of datetimes and times
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+
+        if isinstance(value, (decimal.Decimal, uuid.UUID)):
+            return str(value)
+
+        return value
+
+    def encode_cursor(self, obj):
+        values = [self.encode_value(self.get_value(obj, name)) for name, descending in self.ordering]
+        data = json.dumps(values, cls=DjangoJSONEncoder, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            values = json.loads(data.decode('utf-8'))
+        except (ValueError, TypeError):
+            return None
+
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            return None
+
+        result = []
+
+        for (name, descending), value in zip(self.ordering, values):
+            field = self.get_field(name)
+
+            try:
+                result.append(field.to_python(value) if field is not None else value)
+            except ValidationError:
+                return None
+
+        return result
+
+    def get_ordered_queryset(self, reverse=False):
+        # NULLs of nullable fields are always at the end (at the beginning when paging backwards)
+        ordering = []
+
+        for name, descending in self.ordering:
+            nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+            nulls = nulls if is_nullable_lookup(self.object_list.model, name) else {}
+            ordering.append(F(name).desc(**nulls) if descending != reverse else F(name).asc(**nulls))
+
+        return self.object_list.order_by(*ordering)
+
+    def get_seek_filter(self, values, reverse=False):
+        """
+        (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ... respecting direction of each field
+        and NULLs placed at the end
+        """
+        seek_filter = Q()
+        equal = Q()
+
+        for (name, descending), value in zip(self.ordering, values):
+            lookup = 'lt' if descending != reverse else 'gt'
+
+            if value is None:
+                # NULLs are after all values: nothing follows them, everything else precedes them
+                if reverse:
+                    seek_filter |= equal & Q(**{f'{name}__isnull': False})
+
+                equal &= Q(**{f'{name}__isnull': True})
+                continue
+
+            following = Q(**{f'{name}__{lookup}': value})
+
+            if not reverse and is_nullable_lookup(self.object_list.model, name):
+                following |= Q(**{f'{name}__isnull': True})
+
+            seek_filter |= equal & following
+            equal &= Q(**{name: value})
+
+        return seek_filter
+
+    def page(self, after=None, before=None):
+        """
+        Return page after (or before) given cursor, first page if cursor is missing or invalid.
+        """
+        reverse = before is not None and after is None
+        cursor = self.decode_cursor(before if reverse else after) if (before or after) else None
+        reverse = reverse and cursor is not None
+        queryset = self.get_ordered_queryset(reverse=reverse)
+
+        if cursor is not None:
+            queryset = queryset.filter(self.get_seek_filter(cursor, reverse=reverse))
+
+        object_list = list(queryset[:self.per_page + self.orphans + 1])
+        has_more = len(object_list) > self.per_page + self.orphans
+        object_list = object_list[:self.per_page] if has_more else object_list
+
+        if not object_list and not self.allow_empty_first_page and cursor is None:
+            raise EmptyPage(_('That page contains no results'))
+
+        if reverse:
+            object_list.reverse()
+            return KeysetPage(object_list, self, has_next=True, has_previous=has_more)
+
+        return KeysetPage(object_list, self, has_next=has_more, has_previous=cursor is not None)
+
+
 class DisplayListViewMixin(object):
     displays = []
     paginate_by_display = {}
@@ -368,8 +986,87 @@ class DisplayListViewMixin(object):
         return display
 
     def get_paginator(self, queryset, per_page, orphans=0, allow_empty_first_page=True, **kwargs):
+        count_strategy = getattr(self, 'paginator_count_strategy', None)
+        count_cache_timeout = getattr(self, 'paginator_count_cache_timeout', None)
+
+        if count_strategy is not None:
+            kwargs.setdefault('count_strategy', count_strategy)
+
+        if count_cache_timeout:
+            kwargs.setdefault('count_cache_key', self.get_paginator_count_cache_key())
+            kwargs.setdefault('count_cache_timeout', count_cache_timeout)
+
         return super().get_paginator(queryset, per_page, orphans=0, allow_empty_first_page=True, count_only_id=getattr(self, 'paginator_count_only_id', False), **kwargs)
 
+    def get_paginator_count_cache_key(self):
+        """
+        Cache key of paginator count built from normalized filter querystring (without pagination, sorting and display params)
+        """
+        ignored_params = {self.page_kwarg, 'paginate_by', 'sorting', 'display', KeysetPaginator.after_kwarg, KeysetPaginator.before_kwarg}
+        params = sorted((key, value) for key, values in self.request.GET.lists() if key not in ignored_params for value in values)
+        user = self.request.user if self.request.user.is_authenticated else None
+        key = json.dumps([self.request.path, getattr(user, 'pk', None), params])
+        return 'paginator_count:{}'.format(hashlib.md5(key.encode('utf-8')).hexdigest())
+
+    def paginate_queryset(self, queryset, page_size):
+        if issubclass(self.paginator_class, KeysetPaginator):
+            paginator = self.get_paginator(queryset, page_size, orphans=self.get_paginate_orphans(),
+                                           allow_empty_first_page=self.get_allow_empty())
+            page = paginator.page(after=self.request.GET.get(paginator.after_kwarg) or None,
+                                  before=self.request.GET.get(paginator.before_kwarg) or None)
+            return paginator, page, page.object_list, page.has_other_pages()
+
+        if getattr(self, 'paginator_parallel_queries', False):
+            return self.paginate_queryset_in_parallel(queryset, page_size)
+
+        return super().paginate_queryset(queryset, page_size)
+
+    def get_parallel_counts(self):
+        """
+        Return dict of {context variable name: queryset} counted concurrently with pagination queries
+        """
+        return {}
+
+    def paginate_queryset_in_parallel(self, queryset, page_size):
+        """
+        Run paginator count, page query and parallel counts concurrently on separate database connections
+        """
+        paginator = self.get_paginator(queryset, page_size, orphans=self.get_paginate_orphans(),
+                                       allow_empty_first_page=self.get_allow_empty())
+        page = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+
+        try:
+            page_number = int(page)
+        except ValueError:
+            page_number = None
+
+        if page_number is None or page_number < 1 or getattr(paginator, 'count_strategy', None) == SafePaginator.COUNT_HAS_MORE:
+            # count is needed to resolve the page number or is not needed at all
+            self.parallel_counts = run_in_parallel({name: qs.count for name, qs in self.get_parallel_counts().items()})
+            return super().paginate_queryset(queryset, page_size)
+
+        bottom = (page_number - 1) * paginator.per_page
+        count_key, page_key = object(), object()
+        queries = {name: qs.count for name, qs in self.get_parallel_counts().items()}
+        queries[count_key] = lambda: paginator.count
+        queries[page_key] = lambda: list(queryset[bottom:bottom + paginator.per_page + paginator.orphans])
+        results = run_in_parallel(queries, max_workers=getattr(self, 'paginator_parallel_workers', None))
+
+        object_list = results.pop(page_key)
+        results.pop(count_key)
+        self.parallel_counts = results
+
+        page = paginator.page(page_number)
+
+        if page.number == page_number:
+            # requested page exists, use already fetched rows
+            top = bottom + paginator.per_page
+            if top + paginator.orphans >= paginator.count:
+                top = paginator.count
+            page.object_list = object_list[:top - bottom]
+
+        return paginator, page, page.object_list, page.has_other_pages()
+
     def get_paginate_by(self, queryset):
         """
         Get the number of items to paginate by current display, or ``None`` for no pagination.
@@ -378,6 +1075,7 @@ class DisplayListViewMixin(object):
 
     def get_context_data(self, *args, **kwargs):
         context_data = super().get_context_data(*args, **kwargs)
+        context_data.update(getattr(self, 'parallel_counts', {}))
         context_data['display_modes'] = self.displays
         context_data['paginate_by_display'] = self.paginate_by_display
         context_data['paginate_by'] = self.paginate_by
@@ -400,7 +1098,12 @@ class PaginateListViewMixin(object):
 
 
 class SortingListViewMixin(object):
+    """
+    Sorting options map URL keys to labels or (label, ordering[, index name]) tuples.
+    The index name documents which database index backs the ordering and is verified by system checks.
+    """
     sorting_options = {}
+    sorting_tie_breaker = 'pk'
 
     @property
     def sorting(self):
@@ -428,34 +1131,296 @@ class SortingListViewMixin(object):
             return queryset
 
         if isinstance(self.sorting, list):
-            return queryset.order_by(*self.sorting)
+            return queryset.order_by(*self.add_tie_breaker(queryset.model, self.sorting))
+
+        # NULLS LAST prevents usage of plain b-tree index, use it only if it matters
+        nulls_last = self.sorting.startswith('-') and is_nullable_lookup(queryset.model, self.sorting[1:])
+        sorting = F(self.sorting[1:]).desc(nulls_last=True) if nulls_last else self.sorting
+        return queryset.order_by(*self.add_tie_breaker(queryset.model, [sorting]))
+
+    def add_tie_breaker(self, model, ordering):
+        """
+        Append unique tie-breaker (in direction of the last ordering field) to make ordering stable
+        """
+        if not self.sorting_tie_breaker or not ordering:
+            return ordering
+
+        names = [order.lstrip('-') if isinstance(order, str) else getattr(getattr(order, 'expression', order), 'name', None) for order in ordering]
+        tie_breaker = self.sorting_tie_breaker.lstrip('-')
+
+        if tie_breaker in names or (tie_breaker == 'pk' and model._meta.pk.name in names):
+            return ordering
 
-        sorting = F(self.sorting[1:]).desc(nulls_last=True) if self.sorting.startswith('-') else self.sorting
-        return queryset.order_by(sorting)
+        last = ordering[-1]
+        descending = last.startswith('-') if isinstance(last, str) else getattr(last, 'descending', False)
+        return list(ordering) + [f'-{tie_breaker}' if descending else tie_breaker]
+
+
+def get_free_slug(slug, existing):
+    """
+    Return slug if it is not in existing slugs, slug-N with the lowest free N otherwise
+    """
+    pattern = re.compile(rf'^{re.escape(slug)}(?:-(\d+))?$')
+    taken = set()
+
+    for existing_slug in existing:
+        match = pattern.match(existing_slug)
+
+        if match:
+            taken.add(int(match.group(1)) if match.group(1) else 0)
+
+    if 0 not in taken:
+        return slug
+
+    index = 1
+
+    while index in taken:
+        index += 1
+
+    return f'{slug}-{index}'
+
+
+def is_nullable_lookup(model, lookup):
+    """
+    Return True if lookup (e.g. 'author__name') may be NULL, also when it is unknown (annotation)
+    """
+    if lookup == 'pk':
+        return False
+
+    try:
+        for name in lookup.split(LOOKUP_SEP):
+            field = model._meta.get_field(name)
+
+            if field.null or field.many_to_many or field.one_to_many or (field.one_to_one and field.auto_created):
+                return True
+
+            model = field.related_model or model
+    except FieldDoesNotExist:
+        return True
+
+    return False
 
 
 class SlugMixin(object):
     MAX_SLUG_LENGTH = 150
     FORCE_SLUG_REGENERATION = True
     SLUG_FIELD = 'title'
+    SLUG_SAVE_ATTEMPTS = 3
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remember loaded source value to skip needless slug regeneration
+        instance._slug_source = instance.__dict__.get(cls.SLUG_FIELD, DEFERRED)
+        return instance
+
+    def slug_needs_update(self):
+        if self.slug in EMPTY_VALUES:
+            return True
+
+        if not self.FORCE_SLUG_REGENERATION:
+            return False
+
+        source = getattr(self, '_slug_source', DEFERRED)
+        return source is DEFERRED or source != getattr(self, self.SLUG_FIELD)
+
+    @classmethod
+    def assign_slugs(cls, instances, batch_size=500):
+        """
+        Assign unique slugs to instances (e.g. before bulk_create) in memory,
+        checking them against existing slugs fetched in one query per batch_size of distinct slugs
+        """
+        instances = list(instances)
+        outdated = []
+        # slugs kept by the other instances of the batch
+        used = set()
+
+        for instance in instances:
+            if instance.slug_needs_update():
+                outdated.append(instance)
+            else:
+                used.add(instance.slug)
+
+        slugs = [slugify(getattr(instance, cls.SLUG_FIELD)) for instance in outdated]
+        distinct_slugs = list(dict.fromkeys(slugs))
+        pks = [instance.pk for instance in outdated if instance.pk is not None]
+
+        for start in range(0, len(distinct_slugs), batch_size):
+            startswith = Q()
+
+            for slug in distinct_slugs[start:start + batch_size]:
+                startswith |= cls.get_slug_candidates_filter(slug)
+
+            used.update(cls.objects.filter(startswith).exclude(pk__in=pks).values_list('slug', flat=True))
+
+        next_index = {}
+
+        for instance, slug in zip(outdated, slugs):
+            instance.slug = slug
+            index = next_index.get(slug, 0)
+
+            while instance.slug in used:
+                index += 1
+                instance.slug = f'{slug}-{index}'
+
+            next_index[slug] = index
+            used.add(instance.slug)
+            instance._slug_source = getattr(instance, cls.SLUG_FIELD)
+
+        return instances
 
     def save(self, **kwargs):
-        if self.slug in EMPTY_VALUES or self.FORCE_SLUG_REGENERATION:
+        if self.slug_needs_update():
             slug_field = getattr(self, self.SLUG_FIELD)
             slug = slugify(slug_field)
-            self.slug = slug
-            index = 1
+            self._slug_source = slug_field
 
-            # Ensure uniqueness
-            while self.__class__.objects.filter(slug=self.slug).exclude(pk=self.pk).exists():
-                self.slug = f'{slug}-{index}'
-                index += 1
+            for attempt in range(1, self.SLUG_SAVE_ATTEMPTS + 1):
+                # Ensure uniqueness
+                self.slug = self.get_unique_slug(slug)
+
+                try:
+                    with transaction.atomic(using=kwargs.get('using')):
+                        return super().save(**kwargs)
+                except IntegrityError:
+                    # slug taken by concurrent insert, try next free one
+                    if attempt == self.SLUG_SAVE_ATTEMPTS or not self.slug_exists(self.slug):
+                        raise
 
         return super().save(**kwargs)
 
+    def slug_exists(self, slug):
+        return self.__class__.objects.filter(slug=slug).exclude(pk=self.pk).exists()
+
+    def get_unique_slug(self, slug):
+        """
+        Return slug or slug with the lowest free numeric suffix, using single query
+        """
+        existing = self.__class__.objects.filter(self.get_slug_candidates_filter(slug)).exclude(pk=self.pk).values_list('slug', flat=True)
+        return get_free_slug(slug, existing)
+
+    @staticmethod
+    def get_slug_candidates_filter(slug):
+        """
+        Filter of existing slugs which may collide with slug or its numbered variants
+        """
+        if not slug:
+            # source slugified to empty string: only '' and '-N' collide (slugify strips leading dashes)
+            return Q(slug='') | Q(slug__startswith='-')
+
+        return Q(slug__startswith=slug)
+
+
+class PdfCache(object):
+    """
+    Content-addressed storage of rendered PDF files keyed by hash of HTML and filename.
+    Files are kept in private storage (temporary directory of the server by default).
+    Total size is tracked in the default cache, when it exceeds max_size, the oldest files are deleted.
+    """
+    size_cache_key = 'pragmatic:pdf_cache:size'
+    evict_ratio = 0.8
+
+    def __init__(self, storage=None, directory=None, max_size=None):
+        if storage is None:
+            storage_class = getattr(settings, 'PRAGMATIC_PDF_CACHE_STORAGE', None)
+            storage = import_string(storage_class)() if storage_class else self.get_default_storage()
+
+        self.storage = storage
+        self.directory = directory or getattr(settings, 'PRAGMATIC_PDF_CACHE_DIR', 'pdf_cache')
+        self.max_size = max_size or getattr(settings, 'PRAGMATIC_PDF_CACHE_MAX_SIZE', 512 * 1024 * 1024)
+
+    @staticmethod
+    def get_default_storage():
+        # rendered documents may be private, so they are not stored in (publicly served) media
+        return FileSystemStorage(location=os.path.join(tempfile.gettempdir(), 'pragmatic'))
+
+    @staticmethod
+    def get_key(html_content, filename):
+        digest = hashlib.sha256(html_content)
+        digest.update(b'\0')
+        digest.update(filename.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get_path(self, key):
+        return f'{self.directory}/{key}.pdf'
+
+    def open(self, key):
+        """
+        Return cached PDF file or None
+        """
+        path = self.get_path(key)
+
+        if not self.storage.exists(path):
+            return None
+
+        try:
+            return self.storage.open(path, 'rb')
+        except FileNotFoundError:
+            # evicted meanwhile
+            return None
+
+    def save(self, key, pdf_file):
+        path = self.get_path(key)
+
+        if not self.storage.exists(path):
+            pdf_file.seek(0, os.SEEK_END)
+            size = pdf_file.tell()
+            pdf_file.seek(0)
+            self.storage.save(path, File(pdf_file))
+
+            # storage is listed only when the tracked total size exceeds the limit
+            if self.add_size(size) > self.max_size:
+                self.evict()
+
+    def get_size_cache_key(self):
+        return f'{self.size_cache_key}:{self.directory}'
+
+    def add_size(self, size):
+        key = self.get_size_cache_key()
+        cache.add(key, 0, None)
+
+        try:
+            return cache.incr(key, size)
+        except ValueError:
+            # expired meanwhile
+            cache.set(key, size, None)
+            return size
+
+    def evict(self):
+        """
+        Delete the oldest files until the total size fits evict_ratio of max_size
+        """
+        try:
+            files = [f'{self.directory}/{name}' for name in self.storage.listdir(self.directory)[1]]
+        except (FileNotFoundError, NotImplementedError):
+            return
+
+        files = [(self.storage.get_modified_time(path), self.storage.size(path), path) for path in files]
+        total_size = sum(size for modified, size, path in files)
+
+        for modified, size, path in sorted(files):
+            if total_size <= self.max_size * self.evict_ratio:
+                break
+
+            self.storage.delete(path)
+            total_size -= size
+
+        cache.set(self.get_size_cache_key(), total_size, None)
+
 
 class PdfDetailMixin(object):
     inline = True
+    pdf_cache = False
+    pdf_async = False
+    pdf_job_param = 'pdf_job'
+    pdf_job_timeout = 60 * 60
+    pdf_poll_interval = 2
+    PDF_CHUNK_SIZE = 64 * 1024
+    PDF_SPOOL_MAX_SIZE = 10 * 1024 * 1024
+    PDF_JOB_PENDING = 'pending'
+    PDF_JOB_FAILED = 'failed'
+    pdf_storage_redirect = False
+    _pdf_api_session = None
 
     def dispatch(self, request, *args, **kwargs):
         response = super().dispatch(request, *args, **kwargs)
@@ -463,37 +1428,355 @@ class PdfDetailMixin(object):
         if not getattr(response, 'is_rendered', True) and callable(getattr(response, 'render', None)):
             response.render()
 
-        response = self.render_pdf(response.content, self.get_filename(), self.inline)
+        html_content = response.streaming_content if response.streaming else response.content
+
+        if self.pdf_async:
+            return self.enqueue_pdf(html_content, self.get_filename(), job=request.GET.get(self.pdf_job_param))
+
+        if self.pdf_cache:
+            return self.render_cached_pdf(html_content, self.get_filename(), self.inline)
+
+        response = self.render_pdf(html_content, self.get_filename(), self.inline)
+        return response
+
+    def get_pdf_cache(self):
+        return PdfCache()
+
+    def render_cached_pdf(self, html_content, filename='output.pdf', inline=True):
+        """
+        Serve PDF from cache if the same HTML was rendered before, respond 304 if client has it already
+        """
+        html_content = self.get_html_bytes(html_content)
+        pdf_cache = self.get_pdf_cache()
+        key = pdf_cache.get_key(html_content, filename)
+        etag = quote_etag(key)
+        response = get_conditional_response(self.request, etag=etag)
+
+        if response is None:
+            pdf_file = pdf_cache.open(key)
+
+            if pdf_file is None:
+                pdf_file = self.fetch_pdf(html_content, title=filename)
+                pdf_cache.save(key, pdf_file)
+                pdf_file.seek(0)
+
+            response = self.get_pdf_response(pdf_file, filename, inline)
+
+        response['ETag'] = etag
         return response
 
+    def enqueue_pdf(self, html_content, filename='output.pdf', job=None):
+        """
+        Render PDF in background task and respond 202 with URL to poll for the result.
+        Polling request (job given) responds with status of the job, which has to be the render of this document.
+        """
+        html_content = self.get_html_bytes(html_content)
+        pdf_cache = self.get_pdf_cache()
+        key = pdf_cache.get_key(html_content, filename)
+        status_key = self.get_pdf_job_status_key(key)
+
+        if job is not None:
+            if job != key:
+                raise Http404
+
+            return self.get_pdf_job_response(key)
+
+        if not pdf_cache.storage.exists(pdf_cache.get_path(key)):
+            if cache.get(status_key) == self.PDF_JOB_FAILED:
+                cache.delete(status_key)
+
+            # only the first request enqueues the render
+            if cache.add(status_key, self.PDF_JOB_PENDING, self.pdf_job_timeout):
+                from pragmatic.tasks import render_pdf_in_background
+                view_class = f'{self.__class__.__module__}.{self.__class__.__qualname__}'
+                dispatch_task(render_pdf_in_background, view_class, html_content.decode('utf-8'), filename, key)
+
+        return self.get_pdf_job_response(key)
+
+    def get_pdf_job_response(self, key):
+        """
+        Serve stored PDF if it is ready, otherwise respond with status of the render
+        """
+        status = cache.get(self.get_pdf_job_status_key(key))
+
+        if status == self.PDF_JOB_FAILED:
+            return JsonResponse({'status': status}, status=500)
+
+        if status is None:
+            pdf_cache = self.get_pdf_cache()
+            path = pdf_cache.get_path(key)
+
+            if not pdf_cache.storage.exists(path):
+                raise Http404
+
+            if self.pdf_storage_redirect:
+                # only for private storage with expiring (signed) URLs
+                try:
+                    return redirect(pdf_cache.storage.url(path))
+                except NotImplementedError:
+                    pass
+
+            return self.get_pdf_response(pdf_cache.storage.open(path, 'rb'), self.get_filename(), self.inline)
+
+        url = self.get_pdf_job_url(key)
+        response = JsonResponse({'status': status, 'url': url}, status=202)
+        response['Location'] = url
+        response['Retry-After'] = self.pdf_poll_interval
+        return response
+
+    def get_pdf_job_url(self, key):
+        return f'{self.request.path}?{self.pdf_job_param}={key}'
+
+    @staticmethod
+    def get_pdf_job_status_key(key):
+        return f'pragmatic:pdf_job:{key}'
+
+    @staticmethod
+    def get_html_bytes(html_content):
+        """
+        Join HTML given as string or iterator of chunks to bytes
+        """
+        if isinstance(html_content, bytes):
+            return html_content
+
+        if isinstance(html_content, str):
+            return html_content.encode('utf-8')
+
+        return b''.join(chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in html_content)
+
     def get_filename(self):
         return f'{self.get_object()}.pdf'
 
-    @staticmethod
-    def render_pdf(html_content, filename='output.pdf', inline=True):
+    @classmethod
+    def get_pdf_api_session(cls):
+        """
+        Return HTTP session shared by all requests to PDF API (keeps connections alive)
+        """
+        if PdfDetailMixin._pdf_api_session is None:
+            from requests.adapters import HTTPAdapter
+            session = requests.Session()
+            session.mount('http://', HTTPAdapter(pool_maxsize=20))
+            session.mount('https://', HTTPAdapter(pool_maxsize=20))
+            PdfDetailMixin._pdf_api_session = session
+
+        return PdfDetailMixin._pdf_api_session
+
+    @classmethod
+    def fetch_pdf(cls, html_content, title=None):
+        """
+        Convert HTML (bytes, string or iterator of chunks) to PDF by external API.
+        Returns temporary file with PDF content, kept in memory up to PDF_SPOOL_MAX_SIZE.
+        """
         htmltopdf_api_url = getattr(settings, 'HTMLTOPDF_API_URL', None)
         printmyweb_url = getattr(settings, 'PRINTMYWEB_URL', None)
         printmyweb_token = getattr(settings, 'PRINTMYWEB_TOKEN', None)
 
         print_api_url = htmltopdf_api_url or printmyweb_url
 
-        kwargs = {}
+        kwargs = {
+            'timeout': getattr(settings, 'HTMLTOPDF_API_TIMEOUT', (10, 300)),
+            'stream': True,
+        }
         if printmyweb_token:
             kwargs['headers'] = {
                 'api-key': printmyweb_token
             }
 
-        content_type = 'inline' if inline else 'attachment'
-        pdf_response = requests.post(print_api_url, data=html_content, **kwargs)
-        buffer = io.BytesIO(pdf_response.content)
+        if not isinstance(html_content, (bytes, str)):
+            # upload in chunks (chunked transfer encoding)
+            html_content = (chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in html_content)
 
-        from PyPDF2 import PdfFileMerger
-        pdf_merger = PdfFileMerger()
-        pdf_merger.append(buffer)
-        pdf_merger.addMetadata({'/Title': filename})
-        pdf_merger.write(buffer)
-        buffer.seek(0)
+        pdf_file = tempfile.SpooledTemporaryFile(max_size=cls.PDF_SPOOL_MAX_SIZE)
 
-        response = HttpResponse(buffer, content_type='application/pdf')
+        with cls.get_pdf_api_session().post(print_api_url, data=html_content, **kwargs) as pdf_response:
+            pdf_response.raise_for_status()
+
+            for chunk in pdf_response.iter_content(chunk_size=cls.PDF_CHUNK_SIZE):
+                pdf_file.write(chunk)
+
+        if title and not set_pdf_metadata(pdf_file, {'/Title': title}):
+            # served without the title rather than failing the request
+            pdf_logger.warning('Could not set title of PDF %s (unsupported document)', title)
+
+        pdf_file.seek(0)
+        return pdf_file
+
+    @classmethod
+    def render_pdf(cls, html_content, filename='output.pdf', inline=True):
+        pdf_file = cls.fetch_pdf(html_content, title=filename)
+        return cls.get_pdf_response(pdf_file, filename, inline)
+
+    @classmethod
+    def get_pdf_response(cls, pdf_file, filename='output.pdf', inline=True):
+        content_type = 'inline' if inline else 'attachment'
+        response = FileResponse(pdf_file, content_type='application/pdf')
+        response.block_size = cls.PDF_CHUNK_SIZE
         response['Content-Disposition'] = f'{content_type}; filename="{filename}"'
         return response
+
+
+class PdfExportListMixin(object):
+    """
+    Exports selected objects of a list view to one merged PDF or ZIP of PDFs
+    rendered by PDF API of PdfDetailMixin
+    """
+    pdf_template_name = None
+    pdf_export_view_class = PdfDetailMixin
+    pdf_export_param = 'id'
+    pdf_export_format_param = 'format'
+    pdf_export_combine = False
+    pdf_export_chunk_size = 20
+    pdf_export_max_workers = 4
+    pdf_export_progress_param = 'export_id'
+    pdf_export_progress_poll_param = 'export_progress'
+    pdf_export_progress_timeout = 60 * 60
+    FORMAT_PDF = 'pdf'
+    FORMAT_ZIP = 'zip'
+
+    def get(self, request, *args, **kwargs):
+        progress_id = request.GET.get(self.pdf_export_progress_poll_param, None)
+
+        if progress_id is not None:
+            return JsonResponse(cache.get(self.get_export_progress_key(progress_id)) or {}, status=200)
+
+        try:
+            export_ids = self.get_export_ids()
+        except (ValidationError, ValueError):
+            return HttpResponseBadRequest(_('Invalid objects selected'))
+
+        if not export_ids:
+            # exporting whole list would call PDF API for every object
+            return HttpResponseBadRequest(_('No objects selected'))
+
+        export_format = request.GET.get(self.pdf_export_format_param, self.FORMAT_PDF)
+
+        if export_format == self.FORMAT_ZIP:
+            return self.export_zip()
+
+        return self.export_pdf()
+
+    def get_export_ids(self):
+        return get_pk_values(self.get_queryset().model, self.request.GET.getlist(self.pdf_export_param))
+
+    def get_export_queryset(self):
+        return self.get_queryset().filter(pk__in=self.get_export_ids())
+
+    def get_pdf_template_names(self):
+        if self.pdf_template_name is None:
+            raise ImproperlyConfigured(
+                f'{self.__class__.__name__} requires either a definition of '
+                f'\'pdf_template_name\' or an implementation of \'get_pdf_template_names()\''
+            )
+
+        return [self.pdf_template_name]
+
+    def get_export_html(self, objects):
+        """
+        Render HTML of single object or of list of objects (if pdf_export_combine)
+        """
+        context = {'view': self}
+
+        if isinstance(objects, list):
+            context['object_list'] = objects
+        else:
+            context['object'] = objects
+
+        return render_to_string(self.get_pdf_template_names(), context, request=self.request)
+
+    def get_filename(self):
+        return f'{self.get_queryset().model._meta.verbose_name_plural}.pdf'
+
+    def get_export_filename(self, obj):
+        return f'{obj}.pdf'
+
+    def get_export_chunks(self):
+        """
+        Yield chunks of exported objects
+        """
+        chunk = []
+
+        for obj in self.get_export_queryset().iterator(chunk_size=self.pdf_export_chunk_size):
+            chunk.append(obj)
+
+            if len(chunk) == self.pdf_export_chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    def render_export_chunks(self):
+        """
+        Yield lists of (filename, PDF file) rendered chunk by chunk, at most pdf_export_max_workers API calls at once
+        """
+        fetch_pdf = self.pdf_export_view_class.fetch_pdf
+        total = self.get_export_queryset().count()
+        done = 0
+        self.report_progress(done, total)
+
+        for chunk in self.get_export_chunks():
+            if self.pdf_export_combine:
+                documents = [(f'{chunk[0].pk}.pdf', self.get_export_html(chunk))]
+            else:
+                documents = [(self.get_export_filename(obj), self.get_export_html(obj)) for obj in chunk]
+
+            pdf_files = run_in_parallel({
+                index: partial(fetch_pdf, html_content, title=filename)
+                for index, (filename, html_content) in enumerate(documents)
+            }, max_workers=self.pdf_export_max_workers)
+
+            yield [(filename, pdf_files[index]) for index, (filename, html_content) in enumerate(documents)]
+
+            done += len(chunk)
+            self.report_progress(done, total)
+
+    def export_pdf(self):
+        """
+        Merge PDFs into one document as the chunks get rendered
+        """
+        from pypdf import PdfWriter
+
+        writer = PdfWriter()
+
+        for pdf_files in self.render_export_chunks():
+            for filename, pdf_file in pdf_files:
+                writer.append(pdf_file)
+                pdf_file.close()
+
+        filename = self.get_filename()
+        writer.add_metadata({'/Title': filename})
+
+        output = tempfile.SpooledTemporaryFile(max_size=self.pdf_export_view_class.PDF_SPOOL_MAX_SIZE)
+        writer.write(output)
+        output.seek(0)
+        return self.pdf_export_view_class.get_pdf_response(output, filename, inline=False)
+
+    def export_zip(self):
+        """
+        Stream ZIP of PDFs as the chunks get rendered (PDFs are compressed already, so they are stored)
+        """
+        def entries():
+            for pdf_files in self.render_export_chunks():
+                for filename, pdf_file in pdf_files:
+                    with pdf_file:
+                        yield filename, pdf_file
+
+        response = StreamingHttpResponse(stream_zip(entries(), stored=True), content_type='application/zip')
+        filename = self.get_filename().rsplit('.', 1)[0]
+        response['Content-Disposition'] = f'attachment; filename="{filename}.zip"'
+        return response
+
+    def get_export_progress_key(self, progress_id):
+        if not re.fullmatch(r'[\w-]{1,64}', progress_id):
+            raise Http404
+
+        return f'pragmatic:pdf_export:{progress_id}'
+
+    def report_progress(self, done, total):
+        """
+        Store progress of the export under ID given by client, which can poll it by pdf_export_progress_poll_param
+        """
+        progress_id = self.request.GET.get(self.pdf_export_progress_param, None)
+
+        if progress_id:
+            cache.set(self.get_export_progress_key(progress_id), {'done': done, 'total': total}, self.pdf_export_progress_timeout)
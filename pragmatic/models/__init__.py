@@ -1,10 +1,88 @@
+import base64
+import datetime
+import json
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 
+class DeletedObjectQuerySet(models.QuerySet):
+    """
+    Incremental feed of deleted objects: consumers keep (datetime, id) cursor of the last
+    processed tombstone and fetch only tombstones created after it
+    """
+    def since(self, cursor=None):
+        """
+        Tombstones after given (datetime, id) cursor ordered by (datetime, id)
+        """
+        queryset = self.order_by('datetime', 'id')
+
+        if cursor is not None:
+            created, pk = cursor
+            queryset = queryset.filter(datetime__gte=created).filter(Q(datetime__gt=created) | Q(id__gt=pk))
+
+        return queryset
+
+    def changes_since(self, cursor=None, batch_size=1000):
+        """
+        Yield (tombstones, cursor) batches of at most batch_size tombstones after given cursor,
+        the cursor of each batch points to its last tombstone
+        """
+        while True:
+            batch = list(self.since(cursor)[:batch_size])
+
+            if not batch:
+                return
+
+            cursor = self.get_cursor(batch[-1])
+            yield batch, cursor
+
+            if len(batch) < batch_size:
+                return
+
+    async def achanges_since(self, cursor=None, batch_size=1000):
+        """
+        Asynchronous variant of changes_since
+        """
+        while True:
+            batch = [obj async for obj in self.since(cursor)[:batch_size]]
+
+            if not batch:
+                return
+
+            cursor = self.get_cursor(batch[-1])
+            yield batch, cursor
+
+            if len(batch) < batch_size:
+                return
+
+    @staticmethod
+    def get_cursor(obj):
+        return obj.datetime, obj.pk
+
+    @staticmethod
+    def encode_cursor(cursor):
+        created, pk = cursor
+        data = json.dumps([created.isoformat(), pk], separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+    @staticmethod
+    def decode_cursor(token):
+        """
+        Return (datetime, id) cursor of given token or None if it is invalid
+        """
+        try:
+            data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            created, pk = json.loads(data.decode('utf-8'))
+            return datetime.datetime.fromisoformat(created), int(pk)
+        except (ValueError, TypeError):
+            return None
+
+
 class DeletedObject(models.Model):
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
     object_id = models.PositiveIntegerField(_('object ID'))
@@ -13,12 +91,17 @@ class DeletedObject(models.Model):
         blank=True, null=True, default=None)
     datetime = models.DateTimeField(_('datetime'), auto_now_add=True, db_index=True)
 
+    objects = DeletedObjectQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('deleted object')
         verbose_name_plural = _('deleted objects')
         ordering = ('datetime',)
         get_latest_by = 'datetime'
         default_permissions = getattr(settings, 'DEFAULT_PERMISSIONS', ('add', 'change', 'delete', 'view'))
+        indexes = [
+            models.Index(fields=['content_type', 'object_id'], name='pragmatic_deleted_ct_obj_idx'),
+        ]
 
     def __str__(self):
         return self.object_str
@@ -17,3 +17,17 @@ class LockingTableQuerySetMixin(object):
         table = self.model._meta.db_table
         cursor.execute("LOCK TABLE %s" % table)
         return cursor
+
+
+class SkipLockedQuerySetMixin(object):
+    def claim(self, size, of=()):
+        """ Claim batch of rows.
+
+        Locks and returns up to size rows which are not locked by other
+        transactions (SELECT ... FOR UPDATE SKIP LOCKED), so concurrent workers
+        process disjoint rows instead of waiting for each other.
+
+        Must be called inside atomic block, rows stay locked until it ends.
+        Read more: https://www.postgresql.org/docs/current/sql-select.html#SQL-FOR-UPDATE-SHARE
+        """
+        return list(self.select_for_update(skip_locked=True, of=of)[:size])
@@ -2,6 +2,8 @@ from django.contrib.contenttypes.models import ContentType
 
 from rest_framework import serializers
 
+from pragmatic.models import DeletedObject
+
 
 class ContentTypeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -41,3 +43,11 @@ class ContentTypeNaturalField(serializers.PrimaryKeyRelatedField):
 
     def to_representation(self, value):
         return '.'.join(value.natural_key())
+
+
+class DeletedObjectSerializer(serializers.ModelSerializer):
+    content_type = ContentTypeSerializer(read_only=True)
+
+    class Meta:
+        model = DeletedObject
+        fields = ['id', 'content_type', 'object_id', 'object_str', 'datetime']
@@ -1,9 +1,12 @@
 from collections import defaultdict
+from contextvars import ContextVar
 from functools import wraps
 from pprint import pprint
 
+from asgiref.local import Local
 from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connections, router, transaction
 from django.db.models import signals as django_signals
 from django.db.models.signals import pre_init, post_init, post_save, pre_save, pre_delete, post_delete, post_migrate, \
     pre_migrate, m2m_changed
@@ -318,3 +321,139 @@ class disable_signals:
     def reconnect(self, signal):
         signal.receivers = self.stashed_signals.get(signal, [])
         del self.stashed_signals[signal]
+
+
+_deleting_user = ContextVar('pragmatic_deleting_user', default=None)
+
+
+class deleted_objects_user:
+    """ Attribute objects deleted within the block to given user (evaluated lazily) """
+
+    def __init__(self, user):
+        self.user = user
+
+    def __enter__(self):
+        self.token = _deleting_user.set(self.user)
+
+    def __exit__(self, type, value, traceback):
+        _deleting_user.reset(self.token)
+
+
+class DeletedObjectsBatch(object):
+    def __init__(self, tracker, key):
+        self.tracker = tracker
+        self.key = key
+        self.entries = []
+
+    def flush(self):
+        from django.contrib.contenttypes.models import ContentType
+        from pragmatic.models import DeletedObject
+
+        batches = self.tracker.get_batches()
+
+        if batches.get(self.key) is self:
+            del batches[self.key]
+
+        deleted_objects = []
+
+        for model, object_id, object_str, user in self.entries:
+            deleted_objects.append(DeletedObject(
+                content_type=ContentType.objects.get_for_model(model, for_concrete_model=False),
+                object_id=object_id,
+                object_str=object_str[:300],
+                user=user if user is not None and user.is_authenticated else None
+            ))
+
+        self.entries = []
+
+        DeletedObject.objects.using(router.db_for_write(DeletedObject)).bulk_create(
+            deleted_objects, batch_size=self.tracker.batch_size
+        )
+
+
+class DeletedObjectsTracker(object):
+    """
+    Tracks deletions of registered models (instance, queryset and admin deletes) by post_delete signal
+    and deletions by querysets of TrackDeletesManagerMixin managers.
+    Tombstones are buffered per transaction and stored by one bulk_create when it commits,
+    tombstones of rolled back transactions and savepoints are discarded.
+    """
+    batch_size = 1000
+
+    def __init__(self):
+        self.local = Local()
+        self.models = set()
+
+    def track(self, model):
+        self.models.add(model)
+        post_delete.connect(
+            self.post_delete_receiver,
+            sender=model,
+            weak=False,
+            dispatch_uid=f'pragmatic_track_deletes_{model._meta.label_lower}'
+        )
+
+    def is_tracked(self, model):
+        return model in self.models
+
+    def post_delete_receiver(self, sender, instance, using, **kwargs):
+        self.add(instance, using)
+
+    def add(self, instance, using):
+        # collector resets primary keys of deleted instances after post_delete signals
+        self.add_entries([(type(instance), instance.pk, self.get_object_str(instance, instance.pk))], using)
+
+    def add_rows(self, model, rows, using):
+        """
+        Track deletion of rows given as (object_id, object_str) tuples
+        """
+        self.add_entries([(model, object_id, object_str) for object_id, object_str in rows], using)
+
+    def get_batches(self):
+        if not hasattr(self.local, 'batches'):
+            self.local.batches = {}
+
+        return self.local.batches
+
+    def add_entries(self, entries, using):
+        if not entries:
+            return
+
+        user = _deleting_user.get()
+        entries = [(model, object_id, object_str, user) for model, object_id, object_str in entries]
+        connection = connections[using]
+        batches = self.get_batches()
+        # savepoint rollback discards on_commit callbacks registered within it, so batch is kept per savepoint
+        key = (using, tuple(connection.savepoint_ids))
+        batch = batches.get(key)
+
+        if batch is None or not self.is_pending(batch, connection):
+            # discard batches of rolled back transactions and savepoints
+            for stale_key, stale_batch in list(batches.items()):
+                if stale_key[0] == using and not self.is_pending(stale_batch, connection):
+                    del batches[stale_key]
+
+            batch = batches[key] = DeletedObjectsBatch(self, key)
+            batch.entries.extend(entries)
+            # runs immediately in autocommit mode
+            transaction.on_commit(batch.flush, using=using)
+        else:
+            batch.entries.extend(entries)
+
+    def is_pending(self, batch, connection):
+        return any(callback[1] == batch.flush for callback in connection.run_on_commit)
+
+    def get_object_str(self, instance, object_id):
+        """
+        String representation of instance being deleted
+        """
+        try:
+            object_str = str(instance)
+        except ObjectDoesNotExist:
+            # related object deleted by the same transaction
+            object_str = f'{instance._meta.verbose_name} #{object_id}'
+
+        return object_str[:300]
+
+
+deleted_objects_tracker = DeletedObjectsTracker()
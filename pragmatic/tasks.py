@@ -0,0 +1,22 @@
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+from pragmatic.utils import get_task_decorator
+
+
+@get_task_decorator()
+def render_pdf_in_background(view_class, html_content, filename, key):
+    """
+    Convert HTML to PDF by PDF API of given PdfDetailMixin view and store it into its PDF cache
+    """
+    view_class = import_string(view_class)
+    status_key = view_class.get_pdf_job_status_key(key)
+
+    try:
+        pdf_file = view_class.fetch_pdf(html_content, title=filename)
+        view_class().get_pdf_cache().save(key, pdf_file)
+    except Exception:
+        cache.set(status_key, view_class.PDF_JOB_FAILED, view_class.pdf_job_timeout)
+        raise
+
+    cache.delete(status_key)
@@ -345,6 +345,9 @@ def barcode(code, args=None):
 
 @register.inclusion_tag('helpers/pagination.html', takes_context=True)
 def paginator(context, objects, page_ident='page', anchor=None, adjacent=2):
+    if hasattr(objects, 'next_cursor'):
+        return keyset_paginator(context, objects, anchor)
+
     page_range = objects.paginator.page_range
     number = objects.number
 
@@ -369,6 +372,7 @@ def paginator(context, objects, page_ident='page', anchor=None, adjacent=2):
         'pages': page_range,
         'count': len(page_range),
         'total_count': objects.paginator.count,
+        'total_count_label': getattr(objects.paginator, 'count_label', objects.paginator.count),
         'page_numbers': page_numbers,
         'next': objects.next_page_number,
         'previous': objects.previous_page_number,
@@ -383,6 +387,34 @@ def paginator(context, objects, page_ident='page', anchor=None, adjacent=2):
     }
 
 
+def keyset_paginator(context, objects, anchor=None):
+    request = context.get('request', None)
+    after_kwarg = objects.paginator.after_kwarg
+    before_kwarg = objects.paginator.before_kwarg
+    next_url = None
+    previous_url = None
+
+    if request is not None:
+        url = modify_query_param(request.get_full_path(), f'{after_kwarg}&{before_kwarg}', action='remove')
+
+        if objects.has_next():
+            next_url = modify_query_param(url, f'{after_kwarg}={objects.next_cursor}', action='replace')
+
+        if objects.has_previous():
+            previous_url = modify_query_param(url, f'{before_kwarg}={objects.previous_cursor}', action='replace')
+
+    return {
+        'keyset': True,
+        'anchor': anchor,
+        'request': request,
+        'results_per_page': objects.paginator.per_page,
+        'has_next': objects.has_next,
+        'has_previous': objects.has_previous,
+        'next_url': next_url,
+        'previous_url': previous_url,
+    }
+
+
 @register.filter(is_safe=False)
 def divide(value, arg):
     """Divides the value by argument."""
@@ -4,26 +4,249 @@ def import_name(name):
     return getattr(mod, components[-1])
 
 
-def compress(files):
+def compress(files, compression_level=None, max_workers=None):
+    """
+    Create in-memory ZIP file from list of {'name': ..., 'content': ...} dicts.
+    Entries without name or content are skipped. For large archives use stream_zip.
+    With max_workers, entries are compressed concurrently (see stream_zip).
+    """
     import io
-    import zipfile
+
+    entries = ((file.get('name', None), file.get('content', None)) for file in files)
+    entries = ((name, content) for name, content in entries if name and content)
 
     file_like_object = io.BytesIO()
-    zf = zipfile.ZipFile(file_like_object, mode='w')
+
+    for chunk in stream_zip(entries, compression_level=compression_level, max_workers=max_workers):
+        file_like_object.write(chunk)
+
+    file_like_object.seek(0)
+    return file_like_object
+
+
+def stream_zip(entries, compression_level=None, stored=False, max_workers=None):
+    """
+    Generate ZIP archive of (name, content) entries in chunks, e.g. for StreamingHttpResponse.
+    Content is bytes, string, file-like object or iterator of bytes/strings. Entries are read
+    lazily, so only the current chunk is held in memory. Use stored=True for already
+    compressed content (images, PDFs), compression_level (0-9) tunes deflate.
+
+    With max_workers, entries are compressed concurrently in a thread pool (zlib releases
+    the GIL) and written in order. Up to 2 * max_workers entries are read ahead and held
+    in memory compressed, so their content must stay readable until the archive is done.
+    """
+    import time
+    import zipfile
+    import zlib
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor
+    from functools import partial
+
+    class Buffer(object):
+        # unseekable output, zipfile writes sizes and CRCs to data descriptors
+        def __init__(self):
+            self.chunks = []
+            self.position = 0
+
+        def write(self, data):
+            self.chunks.append(bytes(data))
+            self.position += len(data)
+            return len(data)
+
+        def tell(self):
+            return self.position
+
+        def flush(self):
+            file.flush()
+
+        def flush(self):
+            pass
+
+        def pop(self):
+            data = b''.join(self.chunks)
+            self.chunks = []
+            return data
+
+    def read_chunks(content):
+        if isinstance(content, str):
+            return [content.encode('utf-8')]
+
+        if isinstance(content, bytes):
+            return [content]
+
+        if hasattr(content, 'read'):
+            return iter(partial(content.read, 64 * 1024), b'')
+
+        return (chunk.encode('utf-8') if isinstance(chunk, str) else chunk for chunk in content)
+
+    def deflate(content):
+        level = zlib.Z_DEFAULT_COMPRESSION if compression_level is None else compression_level
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        crc, size, data = 0, 0, []
+
+        for chunk in read_chunks(content):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            data.append(chunk if stored else compressor.compress(chunk))
+
+        if not stored:
+            data.append(compressor.flush())
+
+        return crc, size, b''.join(data)
+
+    def get_zipinfo(name):
+        zinfo = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        zinfo.compress_type = compress_type
+
+        # ZipFile(compresslevel=...) applies only to entries written by write/writestr
+        if hasattr(zinfo, 'compress_level'):
+            zinfo.compress_level = compression_level
+        else:
+            zinfo._compresslevel = compression_level
+
+        return zinfo
+
+    def write_compressed(zf, name, crc, size, data):
+        # local header with known CRC and sizes followed by raw data, as ZipFile.writestr does
+        zinfo = get_zipinfo(name)
+        zinfo.external_attr = 0o600 << 16  # -rw-------, set by ZipFile.open for the other entries
+        zinfo.CRC = crc
+        zinfo.file_size = size
+        zinfo.compress_size = len(data)
+        zinfo.header_offset = zf.fp.tell()
+        zip64 = size > zipfile.ZIP64_LIMIT or len(data) > zipfile.ZIP64_LIMIT
+        zf.fp.write(zinfo.FileHeader(zip64))
+        zf.fp.write(data)
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[name] = zinfo
+        zf.start_dir = zf.fp.tell()
+
+    compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+    buffer = Buffer()
+
+    with zipfile.ZipFile(buffer, mode='w', compression=compress_type, compresslevel=compression_level) as zf:
+        if max_workers:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = deque()
+
+                for name, content in entries:
+                    pending.append((name, executor.submit(deflate, content)))
+
+                    if len(pending) >= 2 * max_workers:
+                        name, future = pending.popleft()
+                        write_compressed(zf, name, *future.result())
+                        yield buffer.pop()
+
+                while pending:
+                    name, future = pending.popleft()
+                    write_compressed(zf, name, *future.result())
+                    yield buffer.pop()
+
+        else:
+            for name, content in entries:
+                zinfo = get_zipinfo(name)
+                known_size = isinstance(content, (bytes, str))
+
+                if known_size:
+                    content = content.encode('utf-8') if isinstance(content, str) else content
+                    zinfo.file_size = len(content)
+
+                with zf.open(zinfo, mode='w', force_zip64=not known_size) as entry:
+                    for chunk in read_chunks(content):
+                        entry.write(chunk)
+                        data = buffer.pop()
+
+                        if data:
+                            yield data
+
+                data = buffer.pop()
+
+                if data:
+                    yield data
+
+    yield buffer.pop()
+
+
+def run_in_parallel(callables, max_workers=None):
+    """
+    Call callables (dict of {name: callable}) concurrently in a thread pool
+    and return dict of {name: result}. Database connections opened by worker
+    threads are closed when each call finishes.
+    Exceptions raised by callables are propagated.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from django.db import connections
+
+    def call(func):
+        try:
+            return func()
+        finally:
+            connections.close_all()
+
+    if not callables:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(callables)) as executor:
+        futures = {name: executor.submit(call, func) for name, func in callables.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def set_pdf_metadata(file, metadata):
+    """
+    Set PDF document information (e.g. {'/Title': 'Invoice'}) by appending
+    an incremental update (pypdf) to file opened for reading and writing,
+    so existing bytes of the document are not rewritten.
+    Entries of the existing document information are kept.
+    Returns False if the document is not supported (e.g. encrypted PDF).
+    """
+    import io
+    from pypdf import PdfReader, PdfWriter
+    from pypdf.errors import PdfReadError
+
+    class IncrementStream(object):
+        # incremental writer copies the original document first, append only the update
+        def __init__(self):
+            self.position = 0
+
+        def write(self, data):
+            skip = max(size - self.position, 0)
+            file.seek(0, io.SEEK_END)
+            file.write(data[skip:])
+            self.position += len(data)
+            return len(data)
+
+        def tell(self):
+            return self.position
+
+        def flush(self):
+            file.flush()
+
+    file.seek(0, io.SEEK_END)
+    size = file.tell()
+    file.seek(0)
+
+    try:
+        reader = PdfReader(file)
+
+        if reader.is_encrypted:
+            return False
+
+        writer = PdfWriter(reader, incremental=True)
+        writer.add_metadata(metadata)
+    except PdfReadError:
+        return False
 
     try:
-        for file in files:
-            name = file.get('name', None)
-            content = file.get('content', None)
-            if name and content:
-                zf.writestr(name, content, compress_type=zipfile.ZIP_DEFLATED)
-
-    except FileNotFoundError:
-        print('An error occurred during compression')
+        writer.write(IncrementStream())
+    except Exception:
+        # leave the original document intact
+        file.seek(size)
+        file.truncate()
+        raise
     finally:
-        zf.close()
-        file_like_object.seek(0)
-        return file_like_object
+        file.seek(0)
+
+    return True
 
 
 def build_absolute_uri(request, location, protocol=None):
@@ -0,0 +1,39 @@
+from django.db import models
+
+from pragmatic.managers import TrackDeletesManagerMixin
+from pragmatic.mixins import SlugMixin
+
+
+class Entry(models.Model):
+    title = models.CharField(max_length=50)
+    created = models.DateTimeField()
+    published = models.DateTimeField(blank=True, null=True)
+
+
+class Article(SlugMixin, models.Model):
+    title = models.CharField(max_length=50)
+    slug = models.SlugField(unique=True)
+
+
+class TagQuerySet(models.QuerySet):
+    def named(self, name):
+        return self.filter(name=name)
+
+
+class TagManager(TrackDeletesManagerMixin, models.Manager.from_queryset(TagQuerySet)):
+    pass
+
+
+class Tag(models.Model):
+    DELETED_OBJECT_STR_FIELD = 'name'
+
+    name = models.CharField(max_length=50)
+
+    objects = TagManager()
+
+    def __str__(self):
+        return self.name
+
+
+class Measurement(models.Model):
+    value = models.IntegerField(blank=True, null=True)
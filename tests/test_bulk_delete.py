@@ -0,0 +1,38 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from django.views.generic import ListView
+
+from pragmatic.mixins import BulkDeleteObjectsMixin
+from tests.models import Entry
+
+
+class EntryBulkDeleteView(BulkDeleteObjectsMixin, ListView):
+    model = Entry
+    message_success = None
+    success_url = '/entries/'
+
+
+class BulkDeleteObjectsMixinTestCase(TestCase):
+    def request(self, method, data):
+        request = getattr(RequestFactory(), method)('/entries/delete/', data)
+        request.user = AnonymousUser()
+        return EntryBulkDeleteView.as_view()(request)
+
+    def test_deletes_selected_objects(self):
+        entries = Entry.objects.bulk_create([Entry(title=str(index), created=timezone.now()) for index in range(3)])
+
+        response = self.request('post', {'id': [entries[0].pk, entries[2].pk]})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(list(Entry.objects.values_list('pk', flat=True)), [entries[1].pk])
+
+    def test_invalid_or_missing_ids(self):
+        Entry.objects.create(title='kept', created=timezone.now())
+
+        for method in ['get', 'post']:
+            for data in [{'id': 'abc'}, {'id': '99999999999999999999999'}, {'id': ''}, {}]:
+                with self.subTest(method=method, data=data):
+                    self.assertEqual(self.request(method, data).status_code, 400)
+
+        self.assertEqual(Entry.objects.count(), 1)
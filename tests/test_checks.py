@@ -0,0 +1,29 @@
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase, override_settings
+from django.views.generic import TemplateView
+
+from pragmatic.checks import check_pdf_async_storage
+from pragmatic.mixins import PdfCache, PdfDetailMixin
+
+
+class PdfAsyncStorageCheckTestCase(SimpleTestCase):
+    def get_error_views(self):
+        return [error.obj for error in check_pdf_async_storage() if error.id == 'pragmatic.E001']
+
+    def test_async_view_requires_storage(self):
+        class AsyncPdfView(PdfDetailMixin, TemplateView):
+            pdf_async = True
+
+        class SyncPdfView(PdfDetailMixin, TemplateView):
+            pass
+
+        class CustomStoragePdfView(PdfDetailMixin, TemplateView):
+            pdf_async = True
+
+            def get_pdf_cache(self):
+                return PdfCache(storage=FileSystemStorage('/srv/shared'))
+
+        self.assertEqual(self.get_error_views(), [AsyncPdfView])
+
+        with override_settings(PRAGMATIC_PDF_CACHE_STORAGE='django.core.files.storage.FileSystemStorage'):
+            self.assertEqual(self.get_error_views(), [])
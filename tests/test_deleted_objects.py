@@ -0,0 +1,85 @@
+import math
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import signals
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from pragmatic.managers import TrackDeletesQuerySetMixin
+from pragmatic.models import DeletedObject
+from pragmatic.signals import deleted_objects_tracker, deleted_objects_user
+from tests.models import Entry, Tag
+
+
+class TrackDeletesManagerMixinTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Tag.objects.bulk_create([Tag(name=f'tag {index}') for index in range(2500)])
+
+    def test_queryset_is_extended(self):
+        self.assertIsInstance(Tag.objects.named('tag 1'), TrackDeletesQuerySetMixin)
+
+    def test_bulk_delete_keeps_fast_delete(self):
+        self.assertFalse(signals.post_delete.has_listeners(Tag))
+
+        with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+            count, deleted = Tag.objects.filter(pk__lte=2001).delete()
+
+        self.assertEqual((count, deleted), (2001, {'tests.Tag': 2001}))
+        sql = [query['sql'] for query in queries.captured_queries]
+        batch_size = connection.ops.bulk_batch_size(['pk'], range(count))
+        # IDs and names read by one query, no instances loaded, rows deleted by IDs in batches, tombstones inserted in bulk
+        self.assertEqual(len([query for query in sql if query.startswith('SELECT') and 'tests_tag' in query]), 1)
+        self.assertEqual(len([query for query in sql if query.startswith('DELETE')]), math.ceil(count / batch_size))
+        self.assertLess(len([query for query in sql if query.startswith('INSERT')]), 20)
+        self.assertEqual(DeletedObject.objects.count(), 2001)
+        self.assertEqual(DeletedObject.objects.get(object_id=1).object_str, 'tag 0')
+
+    def test_user_and_rollback(self):
+        user = get_user_model().objects.create(username='admin')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                with deleted_objects_user(user):
+                    Tag.objects.named('tag 1').delete()
+
+                try:
+                    with transaction.atomic():
+                        Tag.objects.named('tag 2').delete()
+                        raise ValueError
+                except ValueError:
+                    pass
+
+        self.assertEqual(list(DeletedObject.objects.values_list('object_str', 'user')), [('tag 1', user.pk)])
+
+    def test_sliced_queryset_cannot_be_deleted(self):
+        with self.assertRaises(TypeError):
+            Tag.objects.all()[:10].delete()
+
+        self.assertEqual(Tag.objects.count(), 2500)
+
+
+class DeletedObjectsTrackerTestCase(TestCase):
+    def setUp(self):
+        deleted_objects_tracker.track(Entry)
+        self.addCleanup(self.untrack, Entry)
+
+    def untrack(self, model):
+        signals.post_delete.disconnect(sender=model, dispatch_uid=f'pragmatic_track_deletes_{model._meta.label_lower}')
+        deleted_objects_tracker.models.discard(model)
+
+    def test_object_str_of_deleted_instances(self):
+        entries = Entry.objects.bulk_create([Entry(title=title, created=timezone.now()) for title in ['first', 'second']])
+        expected = [(entry.pk, f'Entry object ({entry.pk})') for entry in entries]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for entry in entries:
+                    entry.delete()
+
+                # stored when the outer transaction commits, after collector has reset primary keys
+                self.assertFalse(DeletedObject.objects.exists())
+
+        self.assertEqual(sorted(DeletedObject.objects.values_list('object_id', 'object_str')), expected)
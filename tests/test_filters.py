@@ -0,0 +1,29 @@
+from django.test import TestCase
+
+from pragmatic.filters import SliderFilter
+from tests.models import Measurement
+
+
+class SliderFilterHistogramTestCase(TestCase):
+    def get_histogram(self, values, count=5):
+        Measurement.objects.bulk_create([Measurement(value=value) for value in values])
+        return SliderFilter(field_name='value', count=count).get_histogram(Measurement.objects.all(), 'value')
+
+    def get_segments(self, *counts):
+        return {f'segment_{index}': count for index, count in enumerate(counts)}
+
+    def test_equal_width_buckets(self):
+        min_value, max_value, count, segments = self.get_histogram(range(11))
+
+        self.assertEqual((min_value, max_value, count), (0, 10, 11))
+        # maximum belongs to the last bucket
+        self.assertEqual(segments, self.get_segments(2, 2, 2, 2, 3))
+
+    def test_single_value(self):
+        self.assertEqual(self.get_histogram([7, 7, 7]), (7, 7, 3, self.get_segments(3, 0, 0, 0, 0)))
+
+    def test_null_values_are_counted_without_bucket(self):
+        self.assertEqual(self.get_histogram([None, 1, 3], count=2), (1, 3, 3, self.get_segments(1, 1)))
+
+    def test_empty_queryset(self):
+        self.assertEqual(self.get_histogram([]), (None, None, 0, {}))
@@ -0,0 +1,42 @@
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+
+from pragmatic.mixins import FPDFMixin
+
+
+class FPDFImagesTestCase(SimpleTestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.storage = FileSystemStorage(location=location)
+        FPDFMixin._images.clear()
+        self.addCleanup(FPDFMixin._images.clear)
+
+    def test_images_are_cached_and_bounded(self):
+        for index in range(3):
+            self.storage.save(f'{index}.png', ContentFile(f'image {index}'.encode()))
+
+        with mock.patch.object(FPDFMixin, 'image_cache_size', 2), \
+                mock.patch.object(self.storage, 'open', wraps=self.storage.open) as storage_open:
+            self.assertEqual(FPDFMixin.get_image('0.png', self.storage).read(), b'image 0')
+            self.assertEqual(FPDFMixin.get_image('0.png', self.storage).read(), b'image 0')
+            self.assertEqual(storage_open.call_count, 1)
+
+            FPDFMixin.get_image('1.png', self.storage)
+            FPDFMixin.get_image('2.png', self.storage)
+            self.assertEqual(len(FPDFMixin._images), 2)
+
+    def test_changed_image_expires(self):
+        self.storage.save('logo.png', ContentFile(b'old'))
+        self.assertEqual(FPDFMixin.get_image('logo.png', self.storage).read(), b'old')
+
+        self.storage.delete('logo.png')
+        self.storage.save('logo.png', ContentFile(b'new'))
+
+        with mock.patch.object(FPDFMixin, 'image_cache_timeout', 0):
+            self.assertEqual(FPDFMixin.get_image('logo.png', self.storage).read(), b'new')
@@ -0,0 +1,68 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from pragmatic.mixins import KeysetPaginator
+from tests.models import Entry
+
+
+class KeysetPaginatorTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        start = timezone.now().replace(microsecond=0)
+
+        # datetimes differ in microseconds only
+        Entry.objects.bulk_create([
+            Entry(
+                title=str(index),
+                created=start + datetime.timedelta(microseconds=index * 10),
+                published=start + datetime.timedelta(microseconds=index % 3) if index % 4 else None
+            )
+            for index in range(10)
+        ])
+
+    def collect(self, queryset, per_page=3, backwards=False):
+        paginator = KeysetPaginator(queryset, per_page)
+        page = paginator.page()
+        pks = [obj.pk for obj in page]
+
+        while page.has_next():
+            page = paginator.page(after=paginator.encode_cursor(page[-1]))
+            pks += [obj.pk for obj in page]
+
+            self.assertLessEqual(len(pks), queryset.count())
+
+        if backwards:
+            pks = [obj.pk for obj in page]
+
+            while page.has_previous():
+                page = paginator.page(before=paginator.encode_cursor(page[0]))
+                pks = [obj.pk for obj in page] + pks
+
+        return pks
+
+    def assertPagesEqual(self, queryset):
+        expected = list(queryset.values_list('pk', flat=True))
+        self.assertEqual(self.collect(queryset), expected)
+        self.assertEqual(self.collect(queryset, backwards=True), expected)
+
+    def test_datetime_ordering(self):
+        self.assertPagesEqual(Entry.objects.order_by('created'))
+        self.assertPagesEqual(Entry.objects.order_by('-created'))
+
+    def test_nullable_ordering(self):
+        # paginator puts NULLs at the end in both directions
+        ascending = [entry.pk for entry in sorted(Entry.objects.all(), key=lambda entry: (entry.published is None, entry.published or 0, entry.pk))]
+        descending = [entry.pk for entry in sorted(Entry.objects.exclude(published=None), key=lambda entry: (entry.published, -entry.pk), reverse=True)]
+        descending += list(Entry.objects.filter(published=None).order_by('pk').values_list('pk', flat=True))
+
+        self.assertEqual(self.collect(Entry.objects.order_by('published')), ascending)
+        self.assertEqual(self.collect(Entry.objects.order_by('published'), backwards=True), ascending)
+        self.assertEqual(self.collect(Entry.objects.order_by('-published')), descending)
+        self.assertEqual(self.collect(Entry.objects.order_by('-published'), backwards=True), descending)
+
+    def test_cursor_keeps_microseconds(self):
+        entry = Entry.objects.order_by('created').last()
+        paginator = KeysetPaginator(Entry.objects.order_by('created'), 3)
+        self.assertEqual(paginator.decode_cursor(paginator.encode_cursor(entry)), [entry.created, entry.pk])
@@ -0,0 +1,42 @@
+import io
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+
+from pragmatic.mixins import PdfCache
+
+
+class PdfCacheTestCase(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.location)
+        self.pdf_cache = PdfCache(FileSystemStorage(location=self.location), max_size=1000)
+
+    def save(self, number, size=300):
+        key = PdfCache.get_key(str(number).encode('utf-8'), 'document.pdf')
+        self.pdf_cache.save(key, io.BytesIO(b'x' * size))
+        return key
+
+    def test_default_storage_is_private(self):
+        self.assertTrue(PdfCache().storage.location.startswith(tempfile.gettempdir()))
+
+    def test_evicts_oldest_files_when_size_exceeded(self):
+        with mock.patch.object(self.pdf_cache, 'evict', wraps=self.pdf_cache.evict) as evict:
+            keys = [self.save(number) for number in range(3)]
+            self.assertFalse(evict.called)
+
+            for number, key in enumerate(keys):
+                path = os.path.join(self.location, self.pdf_cache.get_path(key))
+                os.utime(path, (number, number))
+
+            keys.append(self.save(3))
+            self.assertEqual(evict.call_count, 1)
+
+        self.assertEqual([self.pdf_cache.storage.exists(self.pdf_cache.get_path(key)) for key in keys], [False, False, True, True])
+        self.assertEqual(cache.get(self.pdf_cache.get_size_cache_key()), 600)
@@ -0,0 +1,18 @@
+from django.test import RequestFactory, TestCase
+from django.views.generic import ListView
+
+from pragmatic.mixins import PdfExportListMixin
+from tests.models import Entry
+
+
+class EntryExportView(PdfExportListMixin, ListView):
+    model = Entry
+    pdf_template_name = 'entry.html'
+
+
+class PdfExportListMixinTestCase(TestCase):
+    def test_invalid_or_missing_ids(self):
+        for data in [{'id': 'abc'}, {'id': ['1', '2.5']}, {'id': ''}, {}]:
+            with self.subTest(data=data):
+                response = EntryExportView.as_view()(RequestFactory().get('/entries/export/', data))
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,47 @@
+import io
+
+from django.test import SimpleTestCase
+from pypdf import PdfReader, PdfWriter
+
+from pragmatic.utils import set_pdf_metadata
+
+
+class SetPdfMetadataTestCase(SimpleTestCase):
+    def get_pdf(self, **kwargs):
+        writer = PdfWriter()
+        writer.add_blank_page(100, 100)
+        writer.add_metadata({'/Author': 'Author', '/Title': 'Old'})
+
+        if kwargs.get('password'):
+            writer.encrypt(kwargs['password'])
+
+        output = io.BytesIO()
+        writer.write(output)
+        return output.getvalue()
+
+    def test_appends_update_and_keeps_info(self):
+        document = self.get_pdf()
+        pdf_file = io.BytesIO(document)
+
+        self.assertTrue(set_pdf_metadata(pdf_file, {'/Title': 'Faktúra č. 1'}))
+        self.assertTrue(pdf_file.getvalue().startswith(document))
+        self.assertEqual(pdf_file.tell(), 0)
+
+        reader = PdfReader(pdf_file)
+        self.assertEqual(reader.metadata['/Title'], 'Faktúra č. 1')
+        self.assertEqual(reader.metadata['/Author'], 'Author')
+        self.assertEqual(len(reader.pages), 1)
+
+    def test_repeated_update(self):
+        pdf_file = io.BytesIO(self.get_pdf())
+        set_pdf_metadata(pdf_file, {'/Title': 'First'})
+        set_pdf_metadata(pdf_file, {'/Subject': 'Second'})
+
+        metadata = PdfReader(pdf_file).metadata
+        self.assertEqual((metadata['/Title'], metadata['/Subject']), ('First', 'Second'))
+
+    def test_unsupported_document_is_untouched(self):
+        for document in [self.get_pdf(password='secret'), b'not a pdf']:
+            pdf_file = io.BytesIO(document)
+            self.assertFalse(set_pdf_metadata(pdf_file, {'/Title': 'Title'}))
+            self.assertEqual(pdf_file.getvalue(), document)
@@ -0,0 +1,55 @@
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from pragmatic.mixins import SafePaginator
+from tests.models import Entry
+
+
+class SafePaginatorTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Entry.objects.bulk_create([Entry(title=str(index), created=timezone.now()) for index in range(25)])
+
+    def test_exact_count(self):
+        paginator = SafePaginator(Entry.objects.order_by('pk'), 10)
+        self.assertEqual(paginator.count_label, 25)
+        self.assertEqual(paginator.num_pages, 3)
+
+    def test_has_more_count(self):
+        queryset = Entry.objects.order_by('pk')
+
+        paginator = SafePaginator(queryset, 10, count_strategy=SafePaginator.COUNT_HAS_MORE)
+        page = paginator.page(1)
+        self.assertEqual([entry.title for entry in page], [str(index) for index in range(10)])
+        self.assertTrue(page.has_next())
+        self.assertEqual(paginator.count_label, '11+')
+
+        paginator = SafePaginator(queryset, 10, count_strategy=SafePaginator.COUNT_HAS_MORE)
+        page = paginator.page(3)
+        self.assertEqual(len(page), 5)
+        self.assertFalse(page.has_next())
+        self.assertEqual(paginator.count_label, 25)
+
+        # out of range page falls back to the last one
+        paginator = SafePaginator(queryset, 10, count_strategy=SafePaginator.COUNT_HAS_MORE)
+        self.assertEqual(paginator.page(9).number, 3)
+
+    def test_estimate_count(self):
+        queryset = Entry.objects.filter(title__startswith='1')
+
+        with mock.patch.object(SafePaginator, 'estimate_count', return_value=50000):
+            paginator = SafePaginator(queryset, 10, count_strategy=SafePaginator.COUNT_ESTIMATE)
+            self.assertEqual(paginator.count_label, '~50000')
+
+        # estimates under threshold are replaced by exact count
+        with mock.patch.object(SafePaginator, 'estimate_count', return_value=20):
+            paginator = SafePaginator(queryset, 10, count_strategy=SafePaginator.COUNT_ESTIMATE)
+            self.assertEqual(paginator.count_label, 11)
+
+    @skipUnless(connection.vendor == 'postgresql', 'row estimates are read from PostgreSQL planner')
+    def test_postgresql_estimate(self):
+        paginator = SafePaginator(Entry.objects.filter(title__startswith='1'), 10, count_strategy=SafePaginator.COUNT_ESTIMATE)
+        self.assertIsInstance(paginator.estimate_count(), int)
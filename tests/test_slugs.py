@@ -0,0 +1,28 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from tests.models import Article
+
+
+class SlugMixinTestCase(TestCase):
+    def test_numbered_slugs(self):
+        slugs = [Article.objects.create(title='Hello world').slug for index in range(3)]
+        self.assertEqual(slugs, ['hello-world', 'hello-world-1', 'hello-world-2'])
+
+    def test_empty_slug(self):
+        Article.objects.bulk_create(Article.assign_slugs([Article(title=f'Article {index}') for index in range(5)]))
+
+        self.assertEqual(Article.objects.create(title='!!!').slug, '')
+        self.assertEqual(Article.objects.create(title='???').slug, '-1')
+        self.assertEqual([article.slug for article in Article.assign_slugs([Article(title='#'), Article(title='%')])], ['-2', '-3'])
+
+        # other slugs are not loaded to find free empty slug
+        candidates = Article.objects.filter(Article.get_slug_candidates_filter('')).values_list('slug', flat=True)
+        self.assertEqual(sorted(candidates), ['', '-1'])
+
+    def test_assign_slugs_keeps_slugs_of_batch(self):
+        with mock.patch.object(Article, 'FORCE_SLUG_REGENERATION', False):
+            articles = Article.assign_slugs([Article(title='x', slug='hello-world'), Article(title='Hello world')])
+
+        self.assertEqual([article.slug for article in articles], ['hello-world', 'hello-world-1'])